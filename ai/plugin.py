@@ -30,6 +30,12 @@ class UniversalAIPlugin(UniversalBotPlugin):
         self.nist_beacon_url = os.getenv("NIST_BEACON_URL", "https://beacon.nist.gov/beacon/2.0/pulse/last")
         self.openrouter_url = os.getenv("OPENROUTER_API_URL", "https://openrouter.ai/api/v1/chat/completions")
         self.model = "cognitivecomputations/dolphin3.0-mistral-24b:free"
+        self.openrouter_headers = {
+            "Authorization": f"Bearer {self.openrouter_api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "https://github.com/your-repo",
+            "X-Title": "AI Bot Plugin"
+        }
     
     async def initialize(self, adapter) -> bool:
         """Initialize the plugin with bot adapter"""
@@ -56,7 +62,7 @@ class UniversalAIPlugin(UniversalBotPlugin):
     
     async def handle_command(self, context: CommandContext) -> Optional[str]:
         """Handle commands for this plugin"""
-        self.logger.info(f"Handling {context.command} command from {context.user_display_name} on {context.platform.value}")
+        self.logger.info("Handling %s command from %s on %s", context.command, context.user_display_name, context.platform.value)
         
         try:
             if context.command == "8ball":
@@ -302,13 +308,6 @@ Keep response concise but comprehensive."""
     async def _call_openrouter_api(self, prompt: str, max_tokens: int = 300) -> str:
         """Make API call to OpenRouter"""
         try:
-            headers = {
-                "Authorization": f"Bearer {self.openrouter_api_key}",
-                "Content-Type": "application/json",
-                "HTTP-Referer": "https://github.com/your-repo",
-                "X-Title": "AI Bot Plugin"
-            }
-            
             data = {
                 "model": self.model,
                 "messages": [
@@ -319,7 +318,7 @@ Keep response concise but comprehensive."""
             }
             
             async with aiohttp.ClientSession() as session:
-                async with session.post(self.openrouter_url, headers=headers, json=data) as response:
+                async with session.post(self.openrouter_url, headers=self.openrouter_headers, json=data) as response:
                     if response.status == 200:
                         result = await response.json()
                         return result['choices'][0]['message']['content'].strip()
@@ -259,7 +259,7 @@ class UniversalDatabasePlugin(UniversalBotPlugin):
     
     async def handle_command(self, context: CommandContext) -> Optional[str]:
         """Handle commands for this plugin"""
-        self.logger.info(f"Handling {context.command} command from {context.user_display_name}")
+        self.logger.info("Handling %s command from %s", context.command, context.user_display_name)
         
         if not self.bot or not self.enabled:
             self.logger.error("Database functionality not available")
@@ -66,7 +66,7 @@ class UniversalExamplePlugin(UniversalBotPlugin):
     
     async def handle_command(self, context: CommandContext) -> Optional[str]:
         """Handle commands for this plugin"""
-        self.logger.info(f"Handling {context.command} command from {context.user_display_name} on {context.platform.value}")
+        self.logger.info("Handling %s command from %s on %s", context.command, context.user_display_name, context.platform.value)
         
         if not self.enabled:
             return "❌ Example plugin is disabled. Enable it in the plugin code."
@@ -6,10 +6,33 @@ group management, invite generation, and debug commands.
 """
 
 import logging
+import re
+import time
 from typing import List, Optional
 from plugins.universal_plugin_base import UniversalBotPlugin, CommandContext, BotPlatform
 
 
+# Seconds between plugin count refreshes for !stats
+STATS_PLUGIN_COUNT_TTL = 5.0
+
+INVITATION_LINK_RE = re.compile(r'https://simplex\.chat/invitation[^\s]*')
+
+STATS_TEMPLATE = """📊 **SimpleX Bot Statistics**
+
+**WebSocket Status:**
+• Connected: {connected}
+• URL: {websocket_url}
+• Pending Requests: {pending_requests}
+
+**Plugin Status:**
+• Loaded Plugins: {plugin_count}
+• Plugin System: {plugin_system}
+
+**Admin Status:**
+• Total Admins: {admin_count}
+• Admin Config: {admin_config}"""
+
+
 class UniversalSimplexPlugin(UniversalBotPlugin):
     def __init__(self, logger=None):
         super().__init__("simplex", logger=logger)
@@ -21,6 +44,19 @@ class UniversalSimplexPlugin(UniversalBotPlugin):
         
         if not self.logger:
             self.logger = logging.getLogger(f"plugin.{self.name}")
+        
+        # Plugin count snapshot for !stats (refreshed every STATS_PLUGIN_COUNT_TTL seconds)
+        self._cached_plugin_count = None
+        self._cached_plugin_count_ts = 0.0
+        
+        # !admin subcommand dispatch table
+        self._admin_handlers = {
+            "list": self._admin_list,
+            "add": self._admin_add,
+            "remove": self._admin_remove,
+            "permissions": self._admin_permissions,
+            "reload": self._admin_reload,
+        }
     
     async def initialize(self, adapter) -> bool:
         """Initialize plugin with bot adapter"""
@@ -55,7 +91,7 @@ class UniversalSimplexPlugin(UniversalBotPlugin):
     
     async def handle_command(self, context: CommandContext) -> Optional[str]:
         """Handle commands for this plugin"""
-        self.logger.info(f"Handling {context.command} command from {context.user_display_name} on {context.platform.value}")
+        self.logger.info("Handling %s command from %s on %s", context.command, context.user_display_name, context.platform.value)
         
         try:
             if context.command == "invite":
@@ -617,15 +653,13 @@ Pending requests: {len(ws_manager.pending_requests)}"""
                     # Look for invitation link in various possible fields
                     if isinstance(actual_resp, str):
                         if 'https://simplex.chat/invitation' in actual_resp:
-                            import re
-                            match = re.search(r'https://simplex\.chat/invitation[^\s]*', actual_resp)
+                            match = INVITATION_LINK_RE.search(actual_resp)
                             if match:
                                 return match.group(0)
                     elif isinstance(actual_resp, dict):
                         for key, value in actual_resp.items():
                             if isinstance(value, str) and 'https://simplex.chat/invitation' in value:
-                                import re
-                                match = re.search(r'https://simplex\.chat/invitation[^\s]*', value)
+                                match = INVITATION_LINK_RE.search(value)
                                 if match:
                                     return match.group(0)
             return None
@@ -648,61 +682,68 @@ Pending requests: {len(ws_manager.pending_requests)}"""
 !admin reload - Reload admin config"""
         
         subcommand = context.args[0].lower()
+        handler = self._admin_handlers.get(subcommand)
+        if handler is None:
+            return f"Unknown admin subcommand: {subcommand}"
+        return handler(context)
+    
+    def _admin_list(self, context: CommandContext) -> str:
+        """List all admins"""
+        admins = self.admin_manager.list_admins()
+        if not admins:
+            return "No admins configured."
+        
+        admin_list = []
+        for admin_name, commands in admins.items():
+            cmd_str = "all commands" if "*" in commands else ", ".join(commands)
+            admin_list.append(f"• {admin_name}: {cmd_str}")
+        
+        return "Current admins:\n" + "\n".join(admin_list)
+    
+    def _admin_add(self, context: CommandContext) -> str:
+        """Add an admin with full permissions"""
+        if context.arg_count < 2:
+            return "Usage: !admin add <username>"
         
-        if subcommand == "list":
-            admins = self.admin_manager.list_admins()
-            if not admins:
-                return "No admins configured."
-            
-            admin_list = []
-            for admin_name, commands in admins.items():
-                cmd_str = "all commands" if "*" in commands else ", ".join(commands)
-                admin_list.append(f"• {admin_name}: {cmd_str}")
-            
-            return "Current admins:\n" + "\n".join(admin_list)
+        username = context.args[1]
+        if self.admin_manager.add_admin(username):
+            return f"Added {username} as admin with full permissions."
+        else:
+            return f"Failed to add {username} as admin."
+    
+    def _admin_remove(self, context: CommandContext) -> str:
+        """Remove an admin"""
+        if context.arg_count < 2:
+            return "Usage: !admin remove <username>"
         
-        elif subcommand == "add":
-            if context.arg_count < 2:
-                return "Usage: !admin add <username>"
-            
-            username = context.args[1]
-            if self.admin_manager.add_admin(username):
-                return f"Added {username} as admin with full permissions."
-            else:
-                return f"Failed to add {username} as admin."
+        username = context.args[1]
+        if username == context.user_display_name:
+            return "You cannot remove yourself as admin."
         
-        elif subcommand == "remove":
-            if context.arg_count < 2:
-                return "Usage: !admin remove <username>"
-            
-            username = context.args[1]
-            if username == context.user_display_name:
-                return "You cannot remove yourself as admin."
-            
-            if self.admin_manager.remove_admin(username):
-                return f"Removed {username} from admins."
-            else:
-                return f"Failed to remove {username} or user not found."
+        if self.admin_manager.remove_admin(username):
+            return f"Removed {username} from admins."
+        else:
+            return f"Failed to remove {username} or user not found."
+    
+    def _admin_permissions(self, context: CommandContext) -> str:
+        """Show a user's permissions"""
+        if context.arg_count < 2:
+            return "Usage: !admin permissions <username>"
         
-        elif subcommand == "permissions":
-            if context.arg_count < 2:
-                return "Usage: !admin permissions <username>"
-            
-            username = context.args[1]
-            perms = self.admin_manager.get_user_permissions(username)
-            
-            if perms['is_admin']:
-                cmd_str = "all commands" if "*" in perms['admin_commands'] else ", ".join(perms['admin_commands'])
-                return f"User {username} is an admin with permissions: {cmd_str}"
-            else:
-                return f"User {username} is not an admin. Can only run public commands: {', '.join(perms['public_commands'])}"
+        username = context.args[1]
         
-        elif subcommand == "reload":
-            self.admin_manager.reload_config()
-            return "Admin configuration reloaded."
+        perms = self.admin_manager.get_user_permissions(username)
         
+        if perms['is_admin']:
+            cmd_str = "all commands" if "*" in perms['admin_commands'] else ", ".join(perms['admin_commands'])
+            return f"User {username} is an admin with permissions: {cmd_str}"
         else:
-            return f"Unknown admin subcommand: {subcommand}"
+            return f"User {username} is not an admin. Can only run public commands: {', '.join(perms['public_commands'])}"
+    
+    def _admin_reload(self, context: CommandContext) -> str:
+        """Reload admin configuration"""
+        self.admin_manager.reload_config()
+        return "Admin configuration reloaded."
     
     async def _handle_reload_admin_command(self, context: CommandContext) -> str:
         """Handle admin configuration reload"""
@@ -723,24 +764,28 @@ Pending requests: {len(ws_manager.pending_requests)}"""
             return "WebSocket manager not available for stats."
         
         ws_manager = self.bot_instance.websocket_manager
-        
-        # Get basic stats
-        stats_text = f"""📊 **SimpleX Bot Statistics**
-
-**WebSocket Status:**
-• Connected: {'✅ Yes' if ws_manager.websocket else '❌ No'}
-• URL: {ws_manager.websocket_url}
-• Pending Requests: {len(ws_manager.pending_requests)}
-
-**Plugin Status:**
-• Loaded Plugins: {len(getattr(self.adapter.bot, 'plugin_manager', {}).plugins) if hasattr(self.adapter.bot, 'plugin_manager') else 'Unknown'}
-• Plugin System: {'✅ Active' if hasattr(self.adapter.bot, 'plugin_manager') else '❌ Inactive'}
-
-**Admin Status:**
-• Total Admins: {len(self.admin_manager.list_admins())}
-• Admin Config: {'✅ Loaded' if self.admin_manager else '❌ Not Available'}"""
-
-        return stats_text
+        plugin_manager = getattr(self.adapter.bot, 'plugin_manager', None)
+        
+        return STATS_TEMPLATE.format(
+            connected='✅ Yes' if ws_manager.websocket else '❌ No',
+            websocket_url=ws_manager.websocket_url,
+            pending_requests=len(ws_manager.pending_requests),
+            plugin_count=self._get_plugin_count(plugin_manager),
+            plugin_system='✅ Active' if plugin_manager else '❌ Inactive',
+            admin_count=len(self.admin_manager.list_admins()),
+            admin_config='✅ Loaded' if self.admin_manager else '❌ Not Available'
+        )
+    
+    def _get_plugin_count(self, plugin_manager) -> str:
+        """Return the loaded plugin count, refreshing the cached value every few seconds"""
+        if not plugin_manager:
+            return 'Unknown'
+        
+        now = time.monotonic()
+        if self._cached_plugin_count is None or now - self._cached_plugin_count_ts > STATS_PLUGIN_COUNT_TTL:
+            self._cached_plugin_count = len(plugin_manager.plugins)
+            self._cached_plugin_count_ts = now
+        return str(self._cached_plugin_count)
 
     async def cleanup(self):
         """Cleanup when plugin is unloaded"""
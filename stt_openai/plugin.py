@@ -4,8 +4,8 @@ Universal STT OpenAI Plugin - Speech-to-Text using OpenAI Whisper
 This plugin automatically processes audio messages sent to the bot by:
 1. Detecting audio files in messages
 2. Downloading them via XFTP
-3. Doubling the tempo of the audio (2x speed)
-4. Sending processed audio to OpenAI Whisper API
+3. Optionally speeding up the audio with ffmpeg (disabled by default)
+4. Sending the audio to OpenAI Whisper API
 5. Posting transcription back to the chat
 
 Supports OpenAI Whisper API for speech-to-text services.
@@ -13,22 +13,52 @@ Supports OpenAI Whisper API for speech-to-text services.
 
 import aiohttp
 import asyncio
+import hashlib
+import json
 import logging
 import os
-import tempfile
+import re
 import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader  # libyaml-backed parser
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 from plugins.universal_plugin_base import UniversalBotPlugin, CommandContext, BotPlatform
 
+_PLUGIN_DIR = Path(__file__).parent
+
+# How long a successful OpenAI health check is trusted across restarts/reloads
+HEALTH_CHECK_TTL = 3600
+
+# ${VAR_NAME} references in config values
+_ENV_RE = re.compile(r'\$\{([^}]+)\}')
+
+
+def _replace_env_var(match: re.Match) -> str:
+    """Substitute an environment variable, keeping the original text if unset"""
+    return os.getenv(match.group(1), match.group(0))
+
+
+def _hash_file(path: str) -> str:
+    """Return a content hash of a file, read in 1MB blocks"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
 
 class UniversalSTTOpenAIPlugin(UniversalBotPlugin):
     def __init__(self, logger=None):
         super().__init__("stt_openai", logger=logger)
         self.version = "1.0.0"
-        self.description = "Automatic speech-to-text using OpenAI Whisper API with 2x tempo processing"
+        self.description = "Automatic speech-to-text using OpenAI Whisper API"
         
         # Enable for SimpleX platform
         self.supported_platforms = [BotPlatform.SIMPLEX]
@@ -38,32 +68,78 @@ class UniversalSTTOpenAIPlugin(UniversalBotPlugin):
         
         # Load configuration
         self.config = self._load_config()
+        self._prepare_config()
         
         # Audio processing state
         self.processing_audio = set()  # Track files being processed to avoid duplicates
+        
+        # Recent transcriptions keyed by (content hash, request fields, tempo settings)
+        self._transcription_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        
+        # Cap the number of Whisper uploads in flight at once
+        self._transcribe_semaphore = asyncio.Semaphore(self.config["processing"].get("concurrency", 4))
+        
+        # Command dispatch table
+        self._command_handlers = {
+            "transcribe": self._get_stt_status,
+            "stt": self._get_stt_status,
+            "sttconfig": self._get_stt_config_info,
+        }
+        
+        # Shared HTTP session (created on first use by _get_session, closed in cleanup)
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared keep-alive session, creating it on first use or after cleanup closed it"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=16, ttl_dns_cache=300)
+            )
+        return self._session
     
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from config.yaml"""
         try:
-            config_path = Path(__file__).parent / "config.yaml"
+            config_path = _PLUGIN_DIR / "config.yaml"
             self.logger.info(f"🔍 Looking for STT OpenAI config at: {config_path}")
             
-            if config_path.exists():
-                with open(config_path, 'r') as f:
-                    config = yaml.safe_load(f)
-                
-                # Expand environment variables
-                config = self._expand_env_vars(config)
-                
-                self.logger.info("✅ STT OpenAI configuration loaded successfully")
-                return config
-            else:
-                self.logger.warning("❌ No config.yaml found, using defaults")
-                return self._get_default_config()
+            with open(config_path, 'r') as f:
+                config = yaml.load(f, Loader=_YamlLoader)
+            
+            # Expand environment variables
+            config = self._expand_env_vars(config)
+            
+            self.logger.info("✅ STT OpenAI configuration loaded successfully")
+            return config
+        except FileNotFoundError:
+            self.logger.warning("❌ No config.yaml found, using defaults")
+            return self._get_default_config()
         except Exception as e:
             self.logger.error(f"❌ Error loading config: {e}")
             return self._get_default_config()
     
+    def _prepare_config(self):
+        """Precompute per-request values derived from the loaded config"""
+        openai_config = self.config["openai"]
+        processing = self.config["processing"]
+        
+        # Flatten the values read on every transcription into attributes
+        self._api_key = openai_config["api_key"]
+        self._auth_headers = {"Authorization": f"Bearer {self._api_key}"}
+        self._timeout = aiohttp.ClientTimeout(total=openai_config["timeout"])
+        self._max_file_size = processing["max_file_size"]
+        self._supported_formats = frozenset(processing["supported_formats"])
+        self._tempo_multiplier = processing.get("tempo_multiplier", 2.0) if processing.get("enable_tempo", False) else None
+        self._cache_size = processing.get("cache_size", 256)
+        
+        # Whisper form fields other than the file itself; "auto" language is omitted
+        fields = {
+            "model": openai_config["model"],
+            "language": openai_config["language"] if openai_config["language"] != "auto" else None,
+            "response_format": openai_config["response_format"]
+        }
+        self._whisper_form_fields = [(k, str(v)) for k, v in fields.items() if v is not None]
+    
     def _get_default_config(self) -> Dict[str, Any]:
         """Return default configuration"""
         return {
@@ -78,30 +154,28 @@ class UniversalSTTOpenAIPlugin(UniversalBotPlugin):
                 "max_file_size": 26214400,  # 25MB
                 "supported_formats": ["m4a", "wav", "mp3", "mp4", "mpeg", "mpga", "ogg", "webm"],
                 "temp_dir": "/tmp/stt_openai",
-                "tempo_multiplier": 2.0  # Double the tempo
+                "concurrency": 4,  # Max simultaneous transcriptions
+                "cache_size": 256,  # Recent transcriptions kept for forwarded/repeated audio
+                "enable_tempo": False,  # Whisper accepts the original audio as-is
+                "tempo_multiplier": 2.0  # Double the tempo when enabled
             }
         }
     
     def _expand_env_vars(self, config: Dict[str, Any]) -> Dict[str, Any]:
-        """Recursively expand environment variables in config"""
-        import re
-        
-        def expand_value(value):
-            if isinstance(value, str):
-                # Replace ${VAR_NAME} with environment variable value
-                def replace_env_var(match):
-                    var_name = match.group(1)
-                    return os.getenv(var_name, match.group(0))  # Keep original if not found
-                
-                return re.sub(r'\$\{([^}]+)\}', replace_env_var, value)
-            elif isinstance(value, dict):
-                return {k: expand_value(v) for k, v in value.items()}
-            elif isinstance(value, list):
-                return [expand_value(item) for item in value]
-            else:
-                return value
+        """Expand environment variables in config values"""
+        # Walk nested dicts/lists with an explicit stack, rewriting string leaves in place
+        root = [config]
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            items = node.items() if isinstance(node, dict) else enumerate(node)
+            for key, value in list(items):
+                if isinstance(value, str):
+                    node[key] = _ENV_RE.sub(_replace_env_var, value)
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
         
-        return expand_value(config)
+        return root[0]
     
     async def initialize(self, adapter) -> bool:
         """Initialize the plugin"""
@@ -124,42 +198,70 @@ class UniversalSTTOpenAIPlugin(UniversalBotPlugin):
     async def _test_openai_connection(self) -> bool:
         """Test connection to OpenAI API"""
         try:
-            api_key = self.config["openai"]["api_key"]
-            if not api_key:
+            if not self._api_key:
                 self.logger.error("❌ No OpenAI API key configured")
                 return False
             
+            # Skip the round-trip if a recent check with this key succeeded
+            key_fingerprint = hashlib.sha256(self._api_key.encode()).hexdigest()[:16]
+            health_path = Path(self.config["processing"]["temp_dir"]) / ".openai_health"
+            if self._read_health_cache(health_path, key_fingerprint):
+                self.logger.info("✅ OpenAI API connection verified recently (cached)")
+                return True
+            
             # Test with a simple request to models endpoint
             headers = {
-                "Authorization": f"Bearer {api_key}",
+                **self._auth_headers,
                 "Content-Type": "application/json"
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get("https://api.openai.com/v1/models", headers=headers) as response:
-                    if response.status == 200:
-                        self.logger.info("✅ OpenAI API connection successful")
-                        return True
-                    else:
-                        self.logger.error(f"❌ OpenAI API test failed with status {response.status}")
-                        return False
+            async with self._get_session().get("https://api.openai.com/v1/models", headers=headers) as response:
+                if response.status == 200:
+                    self.logger.info("✅ OpenAI API connection successful")
+                    self._write_health_cache(health_path, key_fingerprint)
+                    return True
+                else:
+                    self.logger.error(f"❌ OpenAI API test failed with status {response.status}")
+                    return False
                         
         except Exception as e:
             self.logger.error(f"❌ Failed to test OpenAI connection: {e}")
             return False
     
+    def _read_health_cache(self, health_path: Path, key_fingerprint: str) -> bool:
+        """Return True if a successful health check for this key is still fresh"""
+        try:
+            with open(health_path, 'r') as f:
+                cached = json.load(f)
+            return (cached.get("ok") is True
+                    and cached.get("key") == key_fingerprint
+                    and time.time() - cached.get("ts", 0) < HEALTH_CHECK_TTL)
+        except (OSError, ValueError):
+            return False
+    
+    def _write_health_cache(self, health_path: Path, key_fingerprint: str):
+        """Record a successful health check"""
+        try:
+            health_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(health_path, 'w') as f:
+                json.dump({"ok": True, "key": key_fingerprint, "ts": time.time()}, f)
+        except OSError as e:
+            self.logger.warning(f"⚠️ Failed to write OpenAI health cache: {e}")
+    
     def get_commands(self) -> List[str]:
         """Return list of commands this plugin handles"""
         return ["transcribe", "stt", "sttconfig"]
     
     async def handle_command(self, context: CommandContext) -> str:
         """Handle plugin commands"""
-        if context.command == "transcribe" or context.command == "stt":
-            return "🎤 STT is enabled - just send an audio message and I'll transcribe it automatically!"
-        elif context.command == "sttconfig":
-            return self._get_stt_config_info()
-        else:
+        handler = self._command_handlers.get(context.command)
+        if handler is None:
             return f"Unknown command: {context.command}"
+        return handler()
+    
+    def _get_stt_status(self) -> str:
+        """Get STT status message"""
+        return "🎤 STT is enabled - just send an audio message and I'll transcribe it automatically!"
     
     def _get_stt_config_info(self) -> str:
         """Get STT configuration information"""
@@ -170,34 +272,32 @@ class UniversalSTTOpenAIPlugin(UniversalBotPlugin):
 **Model:** {config['model']}
 **Language:** {config['language']}
 **Response Format:** {config['response_format']}
-**Tempo Multiplier:** {processing['tempo_multiplier']}x
+**Tempo Processing:** {f"{processing.get('tempo_multiplier', 2.0)}x" if processing.get('enable_tempo', False) else 'disabled'}
 **Max File Size:** {processing['max_file_size'] / (1024*1024):.1f} MB
 **Supported Formats:** {', '.join(processing['supported_formats'])}
 **Timeout:** {config['timeout']} seconds"""
     
     async def handle_downloaded_audio(self, filename: str, file_path: str, user_name: str, chat_id: str) -> Optional[str]:
         """Handle downloaded audio file for transcription"""
+        # Key by filename so a duplicate delivery of the same audio is skipped
+        processing_key = filename
+        
+        # Check if already processing
+        if processing_key in self.processing_audio:
+            self.logger.info(f"🎤 STT PLUGIN: {filename} already being processed")
+            return None
+        
+        # Add to processing set
+        self.processing_audio.add(processing_key)
+        self.logger.info(f"🎤 STT PLUGIN: Added {processing_key} to processing queue")
+        
         try:
             self.logger.info(f"🎤 STT PLUGIN: handle_downloaded_audio called for {filename}")
             
-            # Create unique processing ID
-            processing_id = f"{filename}_{int(time.time() * 1000)}"
-            
-            # Check if already processing
-            if processing_id in self.processing_audio:
-                self.logger.info(f"🎤 STT PLUGIN: {filename} already being processed")
-                return None
-            
-            # Add to processing set
-            self.processing_audio.add(processing_id)
-            self.logger.info(f"🎤 STT PLUGIN: Added {processing_id} to processing queue")
-            
-            # Send processing message
-            self.logger.info(f"🎤 STT PLUGIN: Sending processing message...")
-            
             # Start transcription
             self.logger.info(f"🎤 STT PLUGIN: Starting transcription...")
-            transcription_result = await self._transcribe_audio(file_path)
+            async with self._transcribe_semaphore:
+                transcription_result = await self._transcribe_audio(file_path)
             
             if transcription_result:
                 response = self._format_transcription(transcription_result, user_name)
@@ -212,35 +312,43 @@ class UniversalSTTOpenAIPlugin(UniversalBotPlugin):
             return None
         finally:
             # Remove from processing set
-            if processing_id in self.processing_audio:
-                self.processing_audio.remove(processing_id)
-                self.logger.info(f"🎤 STT PLUGIN: Removed {processing_id} from processing queue")
+            self.processing_audio.discard(processing_key)
+            self.logger.info(f"🎤 STT PLUGIN: Removed {processing_key} from processing queue")
+    
+    async def handle_downloaded_audio_batch(self, files: List[Tuple[str, str, str, str]]) -> List[Optional[str]]:
+        """Transcribe several downloaded audio files concurrently
+        
+        Each entry is (filename, file_path, user_name, chat_id); results are returned in the same order.
+        """
+        return await asyncio.gather(*(
+            self.handle_downloaded_audio(filename, file_path, user_name, chat_id)
+            for filename, file_path, user_name, chat_id in files
+        ))
     
-    async def _process_audio_tempo(self, input_path: str) -> Optional[str]:
-        """Process audio to double the tempo using ffmpeg"""
+    async def _process_audio_tempo(self, input_path: str) -> Optional[bytes]:
+        """Process audio to double the tempo using ffmpeg, returning the encoded M4A bytes"""
+        # Tempo processing costs a process spawn and an AAC re-encode; skip unless enabled
+        tempo_multiplier = self._tempo_multiplier
+        if tempo_multiplier is None:
+            return None
+        
         try:
-            # Create temporary directory
-            temp_dir = Path(self.config["processing"]["temp_dir"])
-            temp_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Create temp file for processed audio (keep as M4A)
-            temp_processed = temp_dir / f"tempo_processed_{os.getpid()}_{int(time.time())}.m4a"
-            
-            # Get tempo multiplier from config
-            tempo_multiplier = self.config["processing"]["tempo_multiplier"]
-            
-            # Use ffmpeg to double the tempo while maintaining pitch and format
-            import subprocess
+            # Use ffmpeg to double the tempo while maintaining pitch and format.
+            # Output goes to stdout as fragmented MP4 so no temp file is written and re-read.
             cmd = [
                 'ffmpeg', '-i', input_path,
+                '-vn', '-sn', '-dn',     # Audio only, skip other streams
+                '-threads', '1',
                 '-filter:a', f'atempo={tempo_multiplier}',  # Double tempo
                 '-c:a', 'aac',   # Keep AAC codec for M4A
-                '-y',            # Overwrite output
-                str(temp_processed)
+                '-f', 'mp4', '-movflags', 'frag_keyframe+empty_moov',
+                'pipe:1'
             ]
             
-            self.logger.info(f"🎤 STT DEBUG: Processing audio with {tempo_multiplier}x tempo")
-            self.logger.info(f"🎤 STT DEBUG: ffmpeg command: {' '.join(cmd)}")
+            debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+            if debug_enabled:
+                self.logger.debug(f"🎤 STT DEBUG: Processing audio with {tempo_multiplier}x tempo")
+                self.logger.debug(f"🎤 STT DEBUG: ffmpeg command: {' '.join(cmd)}")
             
             result = await asyncio.create_subprocess_exec(
                 *cmd,
@@ -250,16 +358,13 @@ class UniversalSTTOpenAIPlugin(UniversalBotPlugin):
             
             stdout, stderr = await result.communicate()
             
-            self.logger.info(f"🎤 STT DEBUG: ffmpeg return code: {result.returncode}")
-            self.logger.info(f"🎤 STT DEBUG: ffmpeg stdout: {stdout.decode()}")
-            self.logger.info(f"🎤 STT DEBUG: ffmpeg stderr: {stderr.decode()}")
+            if debug_enabled:
+                self.logger.debug(f"🎤 STT DEBUG: ffmpeg return code: {result.returncode}")
+                self.logger.debug(f"🎤 STT DEBUG: ffmpeg stderr: {stderr.decode(errors='replace')}")
             
             if result.returncode == 0:
-                self.logger.info(f"🎤 STT DEBUG: Audio tempo processing successful")
-                self.logger.info(f"🎤 STT DEBUG: Processed file exists: {os.path.exists(temp_processed)}")
-                if os.path.exists(temp_processed):
-                    self.logger.info(f"🎤 STT DEBUG: Processed file size: {os.path.getsize(temp_processed)} bytes")
-                return str(temp_processed)
+                self.logger.debug(f"🎤 STT DEBUG: Audio tempo processing successful ({len(stdout)} bytes)")
+                return stdout
             else:
                 self.logger.error(f"🎤 STT DEBUG: Audio tempo processing failed: {stderr.decode()}")
                 return None
@@ -270,95 +375,108 @@ class UniversalSTTOpenAIPlugin(UniversalBotPlugin):
     
     async def _transcribe_audio(self, file_path: str) -> Optional[Dict[str, Any]]:
         """Transcribe audio file using OpenAI Whisper API"""
-        processed_file = None
         try:
-            self.logger.info(f"🎤 STT DEBUG: Starting transcription for {file_path}")
+            debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+            self.logger.debug(f"🎤 STT DEBUG: Starting transcription for {file_path}")
             
-            api_key = self.config["openai"]["api_key"]
-            self.logger.info(f"🎤 STT DEBUG: API key configured: {bool(api_key)}")
+            self.logger.debug(f"🎤 STT DEBUG: API key configured: {bool(self._api_key)}")
             
-            if not api_key:
+            if not self._api_key:
                 self.logger.error("❌ No OpenAI API key configured")
                 return None
             
-            # Check file size
-            file_size = os.path.getsize(file_path)
-            max_size = self.config["processing"]["max_file_size"]
-            self.logger.info(f"🎤 STT DEBUG: File size: {file_size} bytes (max: {max_size})")
-            
-            if file_size > max_size:
-                self.logger.error(f"❌ Audio file too large: {file_size} bytes (max: {max_size})")
-                return None
+            # Check file format (no I/O needed)
+            file_ext = os.path.splitext(file_path)[1].lower().lstrip('.')
+            if debug_enabled:
+                self.logger.debug(f"🎤 STT DEBUG: File extension: {file_ext}, supported: {sorted(self._supported_formats)}")
             
-            # Check file format
-            file_ext = Path(file_path).suffix.lower().lstrip('.')
-            supported_formats = self.config["processing"]["supported_formats"]
-            self.logger.info(f"🎤 STT DEBUG: File extension: {file_ext}, supported: {supported_formats}")
-            
-            if file_ext not in supported_formats:
+            if file_ext not in self._supported_formats:
                 self.logger.error(f"❌ Unsupported audio format: {file_ext}")
                 return None
             
-            # Use original audio file directly
-            processed_file = file_path
-            self.logger.info(f"🎤 STT DEBUG: Using original audio file: {processed_file}")
-            
-            # Prepare API request
-            headers = {
-                "Authorization": f"Bearer {api_key}"
-            }
+            # Check file size (single stat call, which also confirms the file exists)
+            try:
+                file_size = os.stat(file_path).st_size
+            except FileNotFoundError:
+                self.logger.error(f"❌ Audio file not found: {file_path}")
+                return None
+            max_size = self._max_file_size
+            self.logger.debug(f"🎤 STT DEBUG: File size: {file_size} bytes (max: {max_size})")
             
-            data = {
-                "model": self.config["openai"]["model"],
-                "language": self.config["openai"]["language"] if self.config["openai"]["language"] != "auto" else None,
-                "response_format": self.config["openai"]["response_format"]
-            }
+            if file_size > max_size:
+                self.logger.error(f"❌ Audio file too large: {file_size} bytes (max: {max_size})")
+                return None
             
-            # Remove None values
-            data = {k: v for k, v in data.items() if v is not None}
+            # Forwarded audio often arrives more than once; reuse the earlier transcription
+            cache_key = (
+                await asyncio.to_thread(_hash_file, file_path),
+                tuple(self._whisper_form_fields),
+                self._tempo_multiplier,
+            )
+            cached = self._transcription_cache.get(cache_key)
+            if cached is not None:
+                self._transcription_cache.move_to_end(cache_key)
+                self.logger.info(f"🎤 STT: Reusing cached transcription for {file_path}")
+                return cached
             
             # Send file to OpenAI
-            self.logger.info(f"🎤 STT DEBUG: Sending processed audio to OpenAI Whisper API...")
-            self.logger.info(f"🎤 STT DEBUG: Request data: {data}")
-            self.logger.info(f"🎤 STT DEBUG: Headers: Authorization header present: {bool(headers.get('Authorization'))}")
-            
-            async with aiohttp.ClientSession() as session:
-                with open(processed_file, 'rb') as audio_file:
-                    form_data = aiohttp.FormData()
-                    form_data.add_field('file', audio_file, filename=os.path.basename(processed_file))
-                    
-                    for key, value in data.items():
-                        form_data.add_field(key, str(value))
-                    
-                    self.logger.info(f"🎤 STT DEBUG: Making POST request to OpenAI...")
-                    
-                    async with session.post(
-                        "https://api.openai.com/v1/audio/transcriptions",
-                        headers=headers,
-                        data=form_data,
-                        timeout=aiohttp.ClientTimeout(total=self.config["openai"]["timeout"])
-                    ) as response:
-                        self.logger.info(f"🎤 STT DEBUG: OpenAI response status: {response.status}")
+            if debug_enabled:
+                self.logger.debug(f"🎤 STT DEBUG: Sending audio to OpenAI Whisper API...")
+                self.logger.debug(f"🎤 STT DEBUG: Request data: {dict(self._whisper_form_fields)}")
+                self.logger.debug(f"🎤 STT DEBUG: Headers: Authorization header present: {bool(self._api_key)}")
+            
+            # Upload tempo-processed bytes straight from ffmpeg when enabled, else the original file
+            processed_audio = await self._process_audio_tempo(file_path)
+            if processed_audio is not None:
+                upload_name = f"{os.path.splitext(os.path.basename(file_path))[0]}.m4a"
+                self.logger.debug(f"🎤 STT DEBUG: Using tempo-processed audio: {upload_name}")
+                result = await self._post_transcription(processed_audio, upload_name)
+            else:
+                self.logger.debug(f"🎤 STT DEBUG: Using original audio file: {file_path}")
+                with open(file_path, 'rb') as audio_file:
+                    result = await self._post_transcription(audio_file, os.path.basename(file_path))
+            
+            if result:
+                self._transcription_cache[cache_key] = result
+                while len(self._transcription_cache) > self._cache_size:
+                    self._transcription_cache.popitem(last=False)
+            return result
                         
-                        if response.status == 200:
-                            result = await response.json()
-                            self.logger.info(f"🎤 STT DEBUG: OpenAI transcription successful")
-                            self.logger.info(f"🎤 STT DEBUG: Transcription result: {result}")
-                            return result
-                        else:
-                            error_text = await response.text()
-                            self.logger.error(f"❌ OpenAI API error {response.status}: {error_text}")
-                            self.logger.error(f"🎤 STT DEBUG: Full error response: {error_text}")
-                            return None
-                            
         except Exception as e:
             self.logger.error(f"❌ Error transcribing audio: {e}")
             import traceback
             self.logger.error(f"🎤 STT DEBUG: Full traceback: {traceback.format_exc()}")
             return None
-        finally:
-            # No cleanup needed since we're using the original file
-            pass
+    
+    async def _post_transcription(self, audio, filename: str) -> Optional[Dict[str, Any]]:
+        """POST audio (file object or bytes) to the Whisper transcription endpoint"""
+        # Assemble the multipart body directly from the precomputed fields. Every part has a
+        # known size (bytes or a regular file), so aiohttp sends Content-Length, not chunked.
+        form_data = aiohttp.MultipartWriter('form-data')
+        for key, value in self._whisper_form_fields:
+            form_data.append(value).set_content_disposition('form-data', name=key)
+        form_data.append(audio).set_content_disposition('form-data', name='file', filename=filename)
+        
+        self.logger.debug(f"🎤 STT DEBUG: Making POST request to OpenAI...")
+        
+        async with self._get_session().post(
+            "https://api.openai.com/v1/audio/transcriptions",
+            headers=self._auth_headers,
+            data=form_data,
+            timeout=self._timeout
+        ) as response:
+            self.logger.debug(f"🎤 STT DEBUG: OpenAI response status: {response.status}")
+            
+            if response.status == 200:
+                result = await response.json()
+                self.logger.debug(f"🎤 STT DEBUG: OpenAI transcription successful")
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(f"🎤 STT DEBUG: Transcription result: {result}")
+                return result
+            else:
+                error_text = await response.text()
+                self.logger.error(f"❌ OpenAI API error {response.status}: {error_text}")
+                return None
     
     def _format_transcription(self, transcription: Dict[str, Any], user_name: str) -> str:
         """Format transcription result for display"""
@@ -373,14 +491,10 @@ class UniversalSTTOpenAIPlugin(UniversalBotPlugin):
     async def cleanup(self):
         """Clean up plugin resources"""
         try:
-            # Clean up any remaining temporary files
-            temp_dir = Path(self.config["processing"]["temp_dir"])
-            if temp_dir.exists():
-                for temp_file in temp_dir.glob("tempo_processed_*"):
-                    try:
-                        temp_file.unlink()
-                    except Exception as e:
-                        self.logger.warning(f"⚠️ Failed to clean up temp file {temp_file}: {e}")
+            # Close the shared HTTP session
+            if self._session and not self._session.closed:
+                await self._session.close()
+            self._session = None
             
             self.logger.info("STT OpenAI plugin cleanup completed")
         except Exception as e:
@@ -14,15 +14,388 @@ import subprocess
 import re
 import aiohttp
 import asyncio
+import codecs
+import functools
+import hashlib
+import itertools
+import math
+import random
+import time
+import queue
+import threading
 import yaml
-from datetime import datetime, timedelta
 from collections import OrderedDict
-from typing import Optional, Tuple, List, Dict, Any
+from typing import Optional, Tuple, List, Dict, Any, Awaitable, Callable, Iterator
 from pathlib import Path
 from plugins.universal_plugin_base import UniversalBotPlugin, CommandContext, BotPlatform
 
+try:
+    from yaml import CSafeLoader as _YamlLoader  # libyaml-backed parser
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    import orjson  # faster JSON encode/decode for OpenRouter bodies
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+    
+    _json_loads = json.loads
+
+try:
+    import zstandard  # cached transcripts are compressed; zstd if available, zlib otherwise
+    _zstd_compressor = zstandard.ZstdCompressor(level=3)
+    _zstd_decompressor = zstandard.ZstdDecompressor()
+    
+    def _compress_text(text: str) -> bytes:
+        return _zstd_compressor.compress(text.encode('utf-8'))
+    
+    def _decompress_text(blob: bytes) -> str:
+        return _zstd_decompressor.decompress(blob).decode('utf-8')
+except ImportError:
+    import zlib
+    
+    def _compress_text(text: str) -> bytes:
+        return zlib.compress(text.encode('utf-8'), 1)
+    
+    def _decompress_text(blob: bytes) -> str:
+        return zlib.decompress(blob).decode('utf-8')
+
+try:
+    import re2 as _markup_re  # google-re2: linear-time DFA matching, faster on long caption files
+except ImportError:
+    _markup_re = re
+
+_PLUGIN_DIR = Path(__file__).parent
+_CONFIG_PATH = _PLUGIN_DIR / "config.yaml"
+# Settings changed with `!ytconfig set`, as dotted path -> value, layered over config.yaml
+_OVERRIDES_PATH = _PLUGIN_DIR / "config.overrides.yaml"
+
+# Longest partial line carried between download chunks before it is cut after a cue
+_MAX_PENDING_LINE = 65536
+# Closing tags of XML cues (srv1 <text>, srv3 <p> and <s>); each one ends a run of words
+_CUE_END_TAGS = ('</text>', '</p>', '</s>')
+_CUE_END_RE = _markup_re.compile(r'</(?:text|p|s)>')
+# Everything in a subtitle file that isn't caption text: the WEBVTT header, cue numbers and
+# any line containing '-->' as whole lines, plus HTML-style tags and embedded cue timestamps anywhere
+_SUBTITLE_CLEAN_RE = _markup_re.compile(
+    r'(?m)^[ \t]*(?:WEBVTT.*|\d+[ \t\r]*|.*-->.*)$|<[^>]+>|\d{2}:\d{2}:\d{2}\.\d{3}'
+)
+
+_OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+_OPENROUTER_MODELS_URL = "https://openrouter.ai/api/v1/models"
+# Headers shared by every OpenRouter request; Authorization is added per API key
+_OPENROUTER_HEADERS = {
+    "Content-Type": "application/json",
+    "HTTP-Referer": "https://github.com/your-repo",
+    "X-Title": "YouTube Bot Plugin"
+}
+
+
+@functools.lru_cache(maxsize=4)
+def _openrouter_headers(api_key: str) -> Dict[str, str]:
+    """Full request headers for an API key, built once instead of on every call"""
+    return {**_OPENROUTER_HEADERS, "Authorization": f"Bearer {api_key}"}
+
+# call_type -> (static instructions, per-call prompt template, ai.max_tokens key); any other
+# call_type sends the text as-is. The instructions go first as a cacheable system block so
+# providers with prompt caching (Anthropic cache_control, Gemini implicit) reuse the prefix
+_PROMPT_TEMPLATES = {
+    "chunk": ("""You summarize parts of YouTube video transcripts.
+
+Focus on:
+- Key points and main ideas
+- Important details and facts
+- Actionable insights
+- Notable quotes or examples
+
+Keep it concise but informative.""",
+              """Summarize this part ({chunk_num}/{total_chunks}) of the YouTube video "{title}":
+
+{text}""", "chunk_summary"),
+    "final": ("""You create comprehensive summaries of YouTube videos from their section summaries.
+
+Create a well-structured summary that:
+- Captures the main theme and purpose
+- Highlights key points and insights in detail
+- Maintains logical flow and structure
+- Includes important examples, quotes, and actionable insights
+- Is thorough but well-organized
+
+Format with clear sections and bullet points where appropriate.""",
+              """Section summaries of the YouTube video "{title}":
+
+{text}""", "final_summary"),
+    "merge": ("""You combine consecutive section summaries of a YouTube video into a single section summary.
+
+Keep the key points, important details, examples and quotes, in their original order.""",
+              """Section summaries of the YouTube video "{title}":
+
+{text}""", "final_summary"),
+    "single_pass": ("""You create comprehensive summaries of YouTube videos from their complete transcripts.
+
+Create a well-structured summary that:
+- Captures the main theme and purpose
+- Highlights all key points and insights in detail
+- Maintains logical flow and structure
+- Includes important examples, quotes, and actionable insights
+- Is thorough but well-organized
+
+Format with clear sections and bullet points where appropriate. Be comprehensive since this is the only chance to capture all important information.""",
+                    """Complete transcript of the YouTube video "{title}":
+
+{text}""", "final_summary"),
+    # The transcript precedes the question so follow-up questions share the cached prefix
+    "qa": ("""You answer questions about YouTube videos based on their transcripts.
+
+Provide a helpful, accurate answer based on the content. If the information isn't in the transcript, say so.""",
+           """Transcript of the YouTube video "{title}":
+
+{text}
+
+Question: {question}""", "qa_response"),
+}
+
+# A final chunk shorter than this fraction of chunk_size is merged into the one before it
+_MIN_TAIL_FRACTION = 0.3
+
+# Placed where the middle of an over-long transcript was cut out
+_ELISION_MARKER = "\n...[middle of transcript omitted]...\n"
+
+# Subtitle formats the parser understands, most preferred first
+_SUBTITLE_FORMATS = ('vtt', 'srv3', 'srv2', 'srv1')
+
+# Query params that do not change which video a URL points to
+_URL_TRACKING_PARAMS = frozenset({'t', 'si', 'feature', 'pp'})
+
+
+# Statuses worth retrying on the same model: rate limiting and transient gateway/upstream failures
+_RETRYABLE_STATUSES = frozenset({429, 502, 503, 504})
+# Longest backoff slept inside a user request; a longer Retry-After gives up instead
+_MAX_RETRY_DELAY = 60.0
+# Longest pause a 429 imposes on every other chat and call type through the shared throttle
+_MAX_RATE_LIMIT_PAUSE = 30.0
+
+# Statuses no other model will fix: the API key is missing, invalid or not allowed
+_AUTH_STATUSES = frozenset({401, 403})
+
+
+class AuthError(Exception):
+    """Raised when OpenRouter rejects the API key (401/403)"""
+    
+    def __init__(self, status: int):
+        super().__init__(f"OpenRouter rejected the API key (HTTP {status})")
+        self.status = status
+
+
+class RetryableAPIError(Exception):
+    """Raised when OpenRouter answers with a transient error (429/502/503/504)"""
+    
+    def __init__(self, status: int, retry_after: Optional[float] = None):
+        super().__init__(f"OpenRouter returned transient HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class RateLimitedError(Exception):
+    """Raised when OpenRouter rate limits a call that should not wait it out inside the request"""
+    
+    def __init__(self, retry_after: Optional[float] = None):
+        if retry_after:
+            super().__init__(f"OpenRouter is rate limiting requests for the next {retry_after:.0f}s")
+        else:
+            super().__init__("OpenRouter is rate limiting requests")
+        self.retry_after = retry_after
+
+
+class TTLCache:
+    """Bounded LRU mapping whose entries expire a fixed number of seconds after being set"""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+    
+    def get(self, key, default=None):
+        """Return the value for key, dropping it if expired and marking it recently used"""
+        item = self._data.get(key)
+        if item is None:
+            return default
+        
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        
+        self._data.move_to_end(key)
+        return value
+    
+    def __setitem__(self, key, value):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        self._evict()
+    
+    def resize(self, maxsize: int, ttl: float):
+        """Apply new limits, evicting least recently used entries straight away if shrinking"""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._evict()
+    
+    def _evict(self):
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def clear(self):
+        self._data.clear()
+
+
+class YDLPool(queue.Queue):
+    """Reusable YoutubeDL instances, each checked out by one worker thread at a time
+    
+    Once closed, instances released by threads that were still running are closed instead of
+    pooled, so nothing leaks when a config reload swaps pools or an extraction outlives its timeout.
+    """
+    
+    def __init__(self, maxsize: int):
+        super().__init__(maxsize)
+        self.closed = False
+        self._close_lock = threading.Lock()
+    
+    def acquire(self, poll: float = 1.0) -> Optional["yt_dlp.YoutubeDL"]:
+        """Block until an instance is free; None once the pool has been closed"""
+        while not self.closed:
+            try:
+                return self.get(timeout=poll)
+            except queue.Empty:
+                pass
+        return None
+    
+    def release(self, ydl: "yt_dlp.YoutubeDL"):
+        """Return a checked-out instance, closing it if the pool has been retired meanwhile"""
+        with self._close_lock:
+            if not self.closed:
+                self.put_nowait(ydl)
+                return
+        ydl.close()
+    
+    def close(self):
+        """Retire the pool and close its idle instances; busy ones are closed on release"""
+        with self._close_lock:
+            self.closed = True
+        while True:
+            try:
+                self.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+# All supported YouTube URL forms (watch, youtu.be, embed, v, mobile, shorts) in one pattern
+_YT_URL_RE = re.compile(
+    r'((?:https?://)?(?:www\.)?(?:m\.)?'
+    r'(?:youtube\.com/(?:watch\?v=|embed/|v/|shorts/)|youtu\.be/)'
+    r'[a-zA-Z0-9_-]+(?:[&?][^\s]*)?)'
+)
+# The video ID inside any of the URL forms above
+_VID_RE = re.compile(r'(?:v=|youtu\.be/|embed/|shorts/|/v/)([A-Za-z0-9_-]{11})')
+
+
+# Pure functions of the message text, memoized because the same links get reposted in busy rooms
+@functools.lru_cache(maxsize=1024)
+def _video_id_str(url: str) -> str:
+    m = _VID_RE.search(url)
+    return m.group(1) if m else url
+
+
+@functools.lru_cache(maxsize=1024)
+def _is_youtube_url_str(text: str) -> bool:
+    return _YT_URL_RE.search(text) is not None
+
 
 class UniversalYouTubePlugin(UniversalBotPlugin):
+    _YT_URL_RE = _YT_URL_RE
+    _VID_RE = _VID_RE
+    
+    # Static help text, rendered once at class definition
+    _YOUTUBE_HELP = """📺 **YouTube Plugin Help**
+
+**Commands:**
+• `!youtube <url>` - Summarize a YouTube video
+• `!youtube <url> <question>` - Process video and answer question directly
+• `!yt <url>` - Alias for youtube command  
+• `!yt <url> <question>` - Process video and ask question in one command
+• `!youtube <question>` - Ask a question about the last processed video
+• `!summary` - Show info about last processed video
+• `!summary <question>` - Ask a question about the last video
+• `!ytconfig` - Configure YouTube plugin settings
+
+**Examples:**
+• `!youtube https://youtube.com/watch?v=...` - Get video summary
+• `!yt https://youtu.be/abc123 What are the main points?` - Get answer directly
+• `!youtube What did they say about X?` - Ask about last video
+• `!summary How long is the video?` - Ask specific question
+
+**Supported URLs:**
+• youtube.com/watch?v=...
+• youtu.be/...
+• m.youtube.com/watch?v=...
+• youtube.com/shorts/...
+
+**Features:**
+• Automatic subtitle extraction
+• AI-powered summarization
+• Q&A about processed videos
+• One-command URL + question processing
+• Per-chat video history
+
+**Requirements:** OPENROUTER_API_KEY environment variable required for AI features."""
+    
+    _CONFIG_HELP = """⚙️ **YouTube Configuration**
+
+**Commands:**
+• `!ytconfig show` - Show current configuration
+• `!ytconfig get <setting>` - Get specific setting value
+• `!ytconfig set <setting> <value>` - Update a setting
+• `!ytconfig reload` - Reload configuration from file
+• `!ytconfig models` - Show available AI models
+
+**Examples:**
+• `!ytconfig show` - Display all settings
+• `!ytconfig get ai.chunk_model` - Show chunk model
+• `!ytconfig set ai.max_tokens.final_summary 1200` - Set final summary tokens
+• `!ytconfig set features.show_progress false` - Disable progress messages
+
+**Configurable Settings:**
+• AI models (chunk_model, final_model, qa_model)
+• Token limits (chunk_summary, final_summary, qa_response)
+• Processing settings (chunk_size, max_chunks)
+• Feature toggles (qa_enabled, show_progress)
+• Cache settings (max_cached_per_room, expiry_hours)"""
+    
+    _AVAILABLE_MODELS = """🤖 **Available Free Models on OpenRouter**
+
+**Recommended for YouTube:**
+• `mistralai/mistral-small-3.2-24b-instruct:free` ⭐ **Best**
+• `mistralai/mistral-small-3.1-24b-instruct:free`
+• `meta-llama/llama-4-maverick:free`
+• `cognitivecomputations/dolphin3.0-mistral-24b:free`
+
+**Rate Limits:** 20 requests/minute, 50-1000 requests/day
+
+**To change model:**
+`!ytconfig set ai.chunk_model mistralai/mistral-small-3.2-24b-instruct:free`
+
+**Model Features:**
+• Mistral 3.2: Latest, optimized for instructions
+• Llama 4: High-capacity MoE architecture  
+• Dolphin 3.0: General purpose, good for Q&A"""
+    
     def __init__(self, logger=None):
         super().__init__("youtube", logger=logger)
         self.version = "2.0.4"  # Testing hot reload with cleanup
@@ -35,60 +408,124 @@ class UniversalYouTubePlugin(UniversalBotPlugin):
         if not self.logger:
             self.logger = logging.getLogger(f"plugin.{self.name}")
         
-        # Load configuration
+        # Load configuration; file (mtime_ns, size) stamps let reloads skip unchanged files
+        self._config_key: Optional[Tuple] = None
+        self._config_cached: Optional[Dict[str, Any]] = None
+        self._config_overrides: Dict[str, Any] = {}
         self.config = self._load_config()
         
         # Plugin state
-        self.transcript_cache = {}  # chat_id -> OrderedDict of URL -> (title, transcript, timestamp)
-        self.last_processed_video = {}  # chat_id -> most recent video URL
+        self.transcript_cache = TTLCache(*self._transcript_cache_limits())  # video ID -> (title, compressed transcript, Q&A budget, compressed Q&A copy), shared by all chats
+        self.last_processed_video = TTLCache(*self._last_video_limits())  # chat_id -> most recent video ID
+        self._llm_cache = TTLCache(*self._llm_cache_limits())  # sha256(model, params, prompt) -> response text
+        
+        # Outbound API throttling (created in initialize, inside the running loop)
+        self._api_sem: Optional[asyncio.Semaphore] = None
+        self._throttle_lock: Optional[asyncio.Lock] = None
+        self._next_request_at = 0.0
+        
+        # Shared HTTP session for subtitle downloads and OpenRouter calls
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._warmup_task: Optional[asyncio.Task] = None
+        
+        # (stage, video ID) -> running extraction or summary, shared by concurrent requests
+        self._inflight: Dict[Tuple[str, str], "asyncio.Future[Any]"] = {}
+        
+        # Reusable YoutubeDL instances; each is used by one worker thread at a time
+        self._ydl_pool = self._build_ydl_pool()
+    
+    def _transcript_cache_limits(self) -> Tuple[int, float]:
+        """Return (max entries, TTL seconds) for the transcript cache from config"""
+        cache_config = self.config["cache"]
+        max_entries = cache_config["max_cached_per_room"] * cache_config.get("max_rooms", 100)
+        return max_entries, cache_config["expiry_hours"] * 3600
+    
+    def _last_video_limits(self) -> Tuple[int, float]:
+        """Return (max chats, TTL seconds) for the last-processed-video map; it expires with the transcripts"""
+        cache_config = self.config["cache"]
+        return cache_config.get("max_rooms", 100), cache_config["expiry_hours"] * 3600
+    
+    def _llm_cache_limits(self) -> Tuple[int, float]:
+        """Return (max entries, TTL seconds) for the LLM response cache from config"""
+        cache_config = self.config["cache"]
+        return cache_config.get("llm_cache_size", 256), cache_config["expiry_hours"] * 3600
+    
+    def _build_ydl_pool(self) -> YDLPool:
+        """Create advanced.extractor_pool_size YoutubeDL instances configured for metadata-only extraction"""
+        ydl_opts = {
+            'writesubtitles': True,
+            'writeautomaticsub': True,
+            'subtitleslangs': self.config["advanced"]["subtitle_languages"],
+            'skip_download': True,
+            'quiet': True,
+            'no_warnings': True,
+            # Only subtitle and title metadata are needed, so skip the stream manifests
+            'extractor_args': {'youtube': {'skip': ['dash', 'hls']}}
+        }
+        
+        pool_size = self.config["advanced"].get("extractor_pool_size", 2)
+        pool = YDLPool(pool_size)
+        for _ in range(pool_size):
+            pool.put(yt_dlp.YoutubeDL(ydl_opts))
+        return pool
     
     @classmethod
     def get_youtube_patterns(cls) -> List[str]:
         """Get all supported YouTube URL patterns"""
-        return [
-            r'((?:https?://)?(?:www\.)?youtube\.com/watch\?v=[a-zA-Z0-9_-]+(?:[&?][^\s]*)?)',
-            r'((?:https?://)?(?:www\.)?youtu\.be/[a-zA-Z0-9_-]+(?:[&?][^\s]*)?)',
-            r'((?:https?://)?(?:www\.)?youtube\.com/embed/[a-zA-Z0-9_-]+(?:[&?][^\s]*)?)',
-            r'((?:https?://)?(?:www\.)?youtube\.com/v/[a-zA-Z0-9_-]+(?:[&?][^\s]*)?)',
-            r'((?:https?://)?(?:www\.)?m\.youtube\.com/watch\?v=[a-zA-Z0-9_-]+(?:[&?][^\s]*)?)',
-            r'((?:https?://)?(?:www\.)?youtube\.com/shorts/[a-zA-Z0-9_-]+(?:[&?][^\s]*)?)'
-        ]
+        return [cls._YT_URL_RE.pattern]
     
     def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from config.yaml"""
+        """Load config.yaml plus saved overrides, reusing the parsed copy if neither file changed"""
         try:
-            config_path = Path(__file__).parent / "config.yaml"
-            self.logger.info(f"🔍 Looking for config at: {config_path}")
-            self.logger.info(f"🔍 Config file exists: {config_path.exists()}")
-            
-            if config_path.exists():
-                with open(config_path, 'r') as f:
-                    config = yaml.safe_load(f)
-                    self.logger.info("✅ YouTube configuration loaded successfully from config.yaml")
-                    
-                    # Log the actual config values being used
-                    ai_config = config.get("ai", {})
-                    self.logger.info(f"🤖 AI CONFIG - chunk_model: {ai_config.get('chunk_model')}")
-                    self.logger.info(f"🤖 AI CONFIG - final_model: {ai_config.get('final_model')}")
-                    self.logger.info(f"🤖 AI CONFIG - qa_model: {ai_config.get('qa_model')}")
-                    
-                    max_tokens = ai_config.get("max_tokens", {})
-                    self.logger.info(f"🎯 MAX_TOKENS - chunk_summary: {max_tokens.get('chunk_summary')}")
-                    self.logger.info(f"🎯 MAX_TOKENS - final_summary: {max_tokens.get('final_summary')}")
-                    self.logger.info(f"🎯 MAX_TOKENS - qa_response: {max_tokens.get('qa_response')}")
-                    
-                    processing = config.get("processing", {})
-                    self.logger.info(f"⚙️ PROCESSING - chunk_size: {processing.get('chunk_size')}")
-                    self.logger.info(f"⚙️ PROCESSING - max_chunks: {processing.get('max_chunks')}")
-                    
-                    return config
-            else:
+            key = (self._file_stamp(_CONFIG_PATH), self._file_stamp(_OVERRIDES_PATH))
+            if key == self._config_key:
+                return self._config_cached
+            
+            if key[0] is None:
                 self.logger.warning("❌ config.yaml not found, using default settings")
-                return self._get_default_config()
+                config = self._get_default_config()
+            else:
+                with open(_CONFIG_PATH, 'r') as f:
+                    config = yaml.load(f, Loader=_YamlLoader)
+                self.logger.info("✅ YouTube configuration loaded successfully from config.yaml")
+            
+            self._apply_overrides(config)
+            self._config_key, self._config_cached = key, config
+            return config
         except Exception as e:
             self.logger.error(f"❌ Error loading config: {e}, using defaults")
             return self._get_default_config()
     
+    @staticmethod
+    def _file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) for a file, or None if it does not exist"""
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+    
+    def _apply_overrides(self, config: Dict[str, Any]):
+        """Layer the saved `!ytconfig set` values from config.overrides.yaml onto config"""
+        try:
+            with open(_OVERRIDES_PATH, 'r') as f:
+                overrides = yaml.load(f, Loader=_YamlLoader) or {}
+        except FileNotFoundError:
+            overrides = {}
+        
+        for setting_path, value in overrides.items():
+            *parents, last_key = setting_path.split('.')
+            config_ref = config
+            for key in parents:
+                config_ref = config_ref.get(key) if isinstance(config_ref, dict) else None
+            
+            if isinstance(config_ref, dict) and last_key in config_ref:
+                config_ref[last_key] = value
+            else:
+                self.logger.warning(f"⚠️ Ignoring unknown override: {setting_path}")
+        
+        self._config_overrides = overrides
+    
     def _get_default_config(self) -> Dict[str, Any]:
         """Get default configuration if config.yaml is missing"""
         return {
@@ -97,20 +534,22 @@ class UniversalYouTubePlugin(UniversalBotPlugin):
                 "final_model": "mistralai/mistral-small-3.2-24b-instruct:free",
                 "qa_model": "mistralai/mistral-small-3.2-24b-instruct:free",
                 "max_tokens": {"chunk_summary": 800, "final_summary": 5000, "qa_response": 5000},
-                "temperature": {"summarization": 0.7, "qa": 0.7}
+                "temperature": {"summarization": 0.7, "qa": 0.7},
+                "concurrency": 5, "requests_per_minute": 20, "final_skip_threshold": 2000
             },
             "processing": {
-                "chunk_size": 8000, "chunk_overlap": 800, "max_chunks": 50,
-                "max_qa_transcript_length": 6000
+                "chunk_size": 8000, "chunk_overlap": 800, "max_chunks": 50, "reduce_fanout": 5,
+                "max_qa_transcript_length": 6000, "single_pass_limit": 32000
             },
-            "cache": {"max_cached_per_room": 5, "expiry_hours": 24},
+            "cache": {"max_cached_per_room": 5, "max_rooms": 100, "expiry_hours": 24, "llm_cache_size": 256},
             "features": {
                 "subtitle_extraction": True, "ai_summarization": True,
                 "qa_enabled": True, "show_progress": True, "caching_enabled": True
             },
             "advanced": {
                 "subtitle_languages": ["en", "en-US", "en-GB"],
-                "extraction_timeout": 30, "ai_timeout": 60, "retry_attempts": 3
+                "extraction_timeout": 30, "ai_timeout": 60, "retry_attempts": 3,
+                "extractor_pool_size": 2
             }
         }
     
@@ -128,6 +567,13 @@ class UniversalYouTubePlugin(UniversalBotPlugin):
             if not api_key:
                 self.logger.warning("OPENROUTER_API_KEY not found - summarization features will be disabled")
             
+            self._api_sem = asyncio.Semaphore(self.config["ai"].get("concurrency", 5))
+            self._throttle_lock = asyncio.Lock()
+            
+            # Open the connection to OpenRouter in the background so the first summary skips DNS/TCP/TLS
+            if api_key:
+                self._warmup_task = asyncio.create_task(self._warmup())
+            
             return True
             
         except Exception as e:
@@ -140,7 +586,7 @@ class UniversalYouTubePlugin(UniversalBotPlugin):
     
     async def handle_command(self, context: CommandContext) -> Optional[str]:
         """Handle commands for this plugin"""
-        self.logger.info(f"Handling {context.command} command from {context.user_display_name} on {context.platform.value}")
+        self.logger.info("Handling %s command from %s on %s", context.command, context.user_display_name, context.platform.value)
         
         try:
             if context.command in ["youtube", "yt", "video"]:
@@ -163,26 +609,22 @@ class UniversalYouTubePlugin(UniversalBotPlugin):
         
         args = context.args_raw.strip()
         
-        # Check if this contains a YouTube URL + question
-        url_match = None
-        question = None
-        
-        # Extract URL and question if both are present
-        for pattern in self.get_youtube_patterns():
-            match = re.search(pattern, args)
-            if match:
-                url_match = match.group(1)
-                # Check if there's text after the URL (potential question)
-                url_end = match.end()
-                remaining_text = args[url_end:].strip()
-                if remaining_text:
-                    question = remaining_text
-                self.logger.info(f"🔍 URL found: {url_match}, Question: {question}")
-                break
+        # Feature flags read once per command
+        feat = self.config["features"]
+        qa_enabled = feat["qa_enabled"]
+        show_progress = feat["show_progress"]
+        ai_enabled = feat["ai_summarization"]
+        
+        # Extract URL and question (any text after the URL) in one scan
+        match = self._YT_URL_RE.search(args)
+        url_match = self._normalize_youtube_url(match.group(1)) if match else None
+        question = (args[match.end():].strip() or None) if match else None
+        if url_match:
+            self.logger.info(f"🔍 URL found: {url_match}, Question: {question}")
         
         # Check if this is a question about the last video (no URL found)
         if not url_match:
-            if self.config["features"]["qa_enabled"]:
+            if qa_enabled:
                 return await self._handle_video_question(context, args)
             else:
                 return "❌ Q&A functionality is disabled in configuration"
@@ -195,32 +637,35 @@ class UniversalYouTubePlugin(UniversalBotPlugin):
             return "❌ YouTube summary feature requires OPENROUTER_API_KEY in environment variables"
         
         # Check if AI summarization is enabled
-        if not self.config["features"]["ai_summarization"]:
+        if not ai_enabled:
             return "❌ AI summarization is disabled in configuration"
         
         try:
-            # Send processing message if enabled
-            if self.config["features"]["show_progress"]:
-                await self.adapter.send_message("🔄 Extracting subtitles from YouTube video...", context)
-            
-            # Extract subtitles
-            subtitles = await self._extract_youtube_subtitles(url)
-            
-            if not subtitles:
-                return "❌ No subtitles found for this video. The video might not have subtitles or be unavailable."
-            
-            # Get video title
-            title = await self._get_youtube_title(url)
+            video_id = self._video_id(url)
+            cached = self._get_cached_transcript(video_id)
+            if cached:
+                # Same video already extracted in some chat; skip yt-dlp and the download
+                title, subtitles = cached
+            else:
+                # Send processing message if enabled
+                if show_progress:
+                    await self.adapter.send_message("🔄 Extracting subtitles from YouTube video...", context)
+                
+                # A burst of requests for one video shares a single extraction
+                title, subtitles = await self._coalesce(("extract", video_id), lambda: self._fetch_transcript(url))
+                
+                if not subtitles:
+                    return "❌ No subtitles found for this video. The video might not have subtitles or be unavailable."
             
             # Cache the transcript for Q&A functionality
-            self._cache_transcript(url, title, subtitles, context.chat_id)
+            self._cache_transcript(video_id, title, subtitles, context.chat_id)
             
             # If a question was provided with the URL, answer it directly
             if question:
                 self.logger.info(f"🤖 Processing Q&A for question: {question}")
-                if self.config["features"]["qa_enabled"]:
+                if qa_enabled:
                     # Send AI processing message if enabled
-                    if self.config["features"]["show_progress"]:
+                    if show_progress:
                         await self.adapter.send_message("🤖 Generating answer using AI...", context)
                     
                     answer = await self._answer_question_about_video(subtitles, title, question)
@@ -237,11 +682,11 @@ class UniversalYouTubePlugin(UniversalBotPlugin):
                 self.logger.info("📄 No question provided, generating summary")
             
             # Send AI processing message if enabled (for summary)
-            if self.config["features"]["show_progress"]:
+            if show_progress:
                 await self.adapter.send_message("🤖 Generating summary using AI...", context)
             
             # Otherwise, provide summary
-            summary = await self._summarize_with_ai(subtitles, title)
+            summary = await self._coalesce(("summary", video_id), lambda: self._summarize_with_ai(subtitles, title))
             
             if summary:
                 response = f"""📺 **{title}**
@@ -253,7 +698,9 @@ class UniversalYouTubePlugin(UniversalBotPlugin):
                 return response
             else:
                 return "❌ Failed to generate summary. Please try again later."
-                
+        
+        except RateLimitedError as e:
+            return f"⏳ {e}. Please try again later."
         except Exception as e:
             self.logger.error(f"Error processing YouTube URL: {e}")
             return f"❌ Error processing YouTube video: {str(e)}"
@@ -262,13 +709,14 @@ class UniversalYouTubePlugin(UniversalBotPlugin):
         """Handle summary command for last processed video"""
         chat_id = context.chat_id
         
-        if chat_id not in self.last_processed_video:
+        last_video_id = self.last_processed_video.get(chat_id)
+        if last_video_id is None:
             return "❌ No recent YouTube video found. Please process a video first with `!youtube <url>`"
         
-        last_url = self.last_processed_video[chat_id]
+        cached = self._get_cached_transcript(last_video_id, for_qa=True)
         
-        if chat_id in self.transcript_cache and last_url in self.transcript_cache[chat_id]:
-            title, transcript, _ = self.transcript_cache[chat_id][last_url]
+        if cached:
+            title, transcript = cached
             
             if context.has_args:
                 # Answer question about the video
@@ -285,13 +733,14 @@ class UniversalYouTubePlugin(UniversalBotPlugin):
         """Handle questions about the last processed video"""
         chat_id = context.chat_id
         
-        if chat_id not in self.last_processed_video:
+        last_video_id = self.last_processed_video.get(chat_id)
+        if last_video_id is None:
             return "❌ No recent YouTube video found. Please process a video first with `!youtube <url>`"
         
-        last_url = self.last_processed_video[chat_id]
+        cached = self._get_cached_transcript(last_video_id, for_qa=True)
         
-        if chat_id in self.transcript_cache and last_url in self.transcript_cache[chat_id]:
-            title, transcript, _ = self.transcript_cache[chat_id][last_url]
+        if cached:
+            title, transcript = cached
             answer = await self._answer_question_about_video(transcript, title, question)
             return f"**Q:** {question}\n\n**A:** {answer}"
         else:
@@ -312,7 +761,7 @@ class UniversalYouTubePlugin(UniversalBotPlugin):
         elif action == "get" and len(args) >= 2:
             return self._get_config(args[1])
         elif action == "reload":
-            return self._reload_config()
+            return await self._reload_config()
         elif action == "models":
             return self._show_available_models()
         else:
@@ -320,96 +769,53 @@ class UniversalYouTubePlugin(UniversalBotPlugin):
     
     def _get_youtube_help(self) -> str:
         """Get YouTube plugin help text"""
-        return """📺 **YouTube Plugin Help**
-
-**Commands:**
-• `!youtube <url>` - Summarize a YouTube video
-• `!youtube <url> <question>` - Process video and answer question directly
-• `!yt <url>` - Alias for youtube command  
-• `!yt <url> <question>` - Process video and ask question in one command
-• `!youtube <question>` - Ask a question about the last processed video
-• `!summary` - Show info about last processed video
-• `!summary <question>` - Ask a question about the last video
-• `!ytconfig` - Configure YouTube plugin settings
-
-**Examples:**
-• `!youtube https://youtube.com/watch?v=...` - Get video summary
-• `!yt https://youtu.be/abc123 What are the main points?` - Get answer directly
-• `!youtube What did they say about X?` - Ask about last video
-• `!summary How long is the video?` - Ask specific question
-
-**Supported URLs:**
-• youtube.com/watch?v=...
-• youtu.be/...
-• m.youtube.com/watch?v=...
-• youtube.com/shorts/...
-
-**Features:**
-• Automatic subtitle extraction
-• AI-powered summarization
-• Q&A about processed videos
-• One-command URL + question processing
-• Per-chat video history
-
-**Requirements:** OPENROUTER_API_KEY environment variable required for AI features."""
+        return self._YOUTUBE_HELP
     
     def _get_config_help(self) -> str:
         """Get configuration help text"""
-        return """⚙️ **YouTube Configuration**
-
-**Commands:**
-• `!ytconfig show` - Show current configuration
-• `!ytconfig get <setting>` - Get specific setting value
-• `!ytconfig set <setting> <value>` - Update a setting
-• `!ytconfig reload` - Reload configuration from file
-• `!ytconfig models` - Show available AI models
-
-**Examples:**
-• `!ytconfig show` - Display all settings
-• `!ytconfig get ai.chunk_model` - Show chunk model
-• `!ytconfig set ai.max_tokens.final_summary 1200` - Set final summary tokens
-• `!ytconfig set features.show_progress false` - Disable progress messages
-
-**Configurable Settings:**
-• AI models (chunk_model, final_model, qa_model)
-• Token limits (chunk_summary, final_summary, qa_response)
-• Processing settings (chunk_size, max_chunks)
-• Feature toggles (qa_enabled, show_progress)
-• Cache settings (max_cached_per_room, expiry_hours)"""
+        return self._CONFIG_HELP
     
     def _show_config(self) -> str:
         """Show current configuration"""
-        config_str = "⚙️ **YouTube Plugin Configuration**\n\n"
-        
-        # AI Settings
         ai = self.config["ai"]
-        config_str += f"**🤖 AI Models:**\n"
-        config_str += f"• Chunk: `{ai['chunk_model']}`\n"
-        config_str += f"• Final: `{ai['final_model']}`\n"
-        config_str += f"• Q&A: `{ai['qa_model']}`\n\n"
-        
-        config_str += f"**📊 Token Limits:**\n"
         tokens = ai["max_tokens"]
-        config_str += f"• Chunk Summary: {tokens['chunk_summary']}\n"
-        config_str += f"• Final Summary: {tokens['final_summary']}\n"
-        config_str += f"• Q&A Response: {tokens['qa_response']}\n\n"
-        
-        # Processing Settings
         proc = self.config["processing"]
-        config_str += f"**🔧 Processing:**\n"
-        config_str += f"• Chunk Size: {proc['chunk_size']}\n"
-        config_str += f"• Max Chunks: {proc['max_chunks']}\n"
-        config_str += f"• Chunk Overlap: {proc['chunk_overlap']}\n\n"
-        
-        # Features
         feat = self.config["features"]
-        config_str += f"**✨ Features:**\n"
-        config_str += f"• AI Summarization: {'✅' if feat['ai_summarization'] else '❌'}\n"
-        config_str += f"• Q&A: {'✅' if feat['qa_enabled'] else '❌'}\n"
-        config_str += f"• Progress Messages: {'✅' if feat['show_progress'] else '❌'}\n"
-        config_str += f"• Caching: {'✅' if feat['caching_enabled'] else '❌'}\n"
         
-        return config_str
+        def flag(name: str) -> str:
+            return '✅' if feat[name] else '❌'
+        
+        parts = [
+            "⚙️ **YouTube Plugin Configuration**",
+            "",
+            # AI Settings
+            "**🤖 AI Models:**",
+            f"• Chunk: `{ai['chunk_model']}`",
+            f"• Final: `{ai['final_model']}`",
+            f"• Q&A: `{ai['qa_model']}`",
+            "",
+            "**📊 Token Limits:**",
+            f"• Chunk Summary: {tokens['chunk_summary']}",
+            f"• Final Summary: {tokens['final_summary']}",
+            f"• Q&A Response: {tokens['qa_response']}",
+            "",
+            # Processing Settings
+            "**🔧 Processing:**",
+            f"• Single-Pass Limit: {proc.get('single_pass_limit', 32000)}",
+            f"• Chunk Size: {proc['chunk_size']}",
+            f"• Max Chunks: {proc['max_chunks']}",
+            f"• Chunk Overlap: {proc['chunk_overlap']}",
+            "",
+            # Features
+            "**✨ Features:**",
+            f"• AI Summarization: {flag('ai_summarization')}",
+            f"• Q&A: {flag('qa_enabled')}",
+            f"• Progress Messages: {flag('show_progress')}",
+            f"• Caching: {flag('caching_enabled')}",
+            "",
+        ]
+        
+        return '\n'.join(parts)
     
     def _get_config(self, setting_path: str) -> str:
         """Get a specific configuration value"""
@@ -453,175 +859,217 @@ class UniversalYouTubePlugin(UniversalBotPlugin):
             old_value = config_ref[last_key]
             config_ref[last_key] = value
             
-            # Save configuration to file
+            # Persist only the overrides; config.yaml itself (and its comments) is never rewritten
+            had_override = setting_path in self._config_overrides
+            old_override = self._config_overrides.get(setting_path)
+            self._config_overrides[setting_path] = value
             try:
-                config_path = Path(__file__).parent / "config.yaml"
-                with open(config_path, 'w') as f:
-                    yaml.dump(self.config, f, default_flow_style=False, indent=2)
+                with open(_OVERRIDES_PATH, 'w') as f:
+                    yaml.safe_dump(self._config_overrides, f, default_flow_style=False)
                 
                 return f"✅ Updated `{setting_path}`: `{old_value}` → `{value}`\n💾 Configuration saved to file"
             except Exception as e:
                 # Rollback the change
                 config_ref[last_key] = old_value
+                if had_override:
+                    self._config_overrides[setting_path] = old_override
+                else:
+                    del self._config_overrides[setting_path]
                 return f"❌ Failed to save configuration: {e}"
                 
         except Exception as e:
             return f"❌ Error updating setting: {e}"
     
-    def _reload_config(self) -> str:
+    async def _reload_config(self) -> str:
         """Reload configuration from file"""
         try:
-            old_config = self.config.copy()
-            self.config = self._load_config()
+            config = self._load_config()
+            if config is self.config:
+                return "✅ Configuration unchanged, nothing to reload"
+            
+            self.config = config
+            self.transcript_cache.resize(*self._transcript_cache_limits())
+            self._llm_cache.resize(*self._llm_cache_limits())
+            self.last_processed_video.resize(*self._last_video_limits())
+            # Constructing YoutubeDL instances initializes every extractor; keep that off the event loop
+            old_pool, self._ydl_pool = self._ydl_pool, await asyncio.to_thread(self._build_ydl_pool)
+            await asyncio.to_thread(old_pool.close)
+            if self._api_sem:
+                # In-flight calls release the old semaphore; new chunk fan-outs use the new limit
+                self._api_sem = asyncio.Semaphore(self.config["ai"].get("concurrency", 5))
             return "✅ Configuration reloaded successfully from config.yaml"
         except Exception as e:
             return f"❌ Error reloading configuration: {e}"
     
     def _show_available_models(self) -> str:
         """Show available free models"""
-        return """🤖 **Available Free Models on OpenRouter**
-
-**Recommended for YouTube:**
-• `mistralai/mistral-small-3.2-24b-instruct:free` ⭐ **Best**
-• `mistralai/mistral-small-3.1-24b-instruct:free`
-• `meta-llama/llama-4-maverick:free`
-• `cognitivecomputations/dolphin3.0-mistral-24b:free`
-
-**Rate Limits:** 20 requests/minute, 50-1000 requests/day
-
-**To change model:**
-`!ytconfig set ai.chunk_model mistralai/mistral-small-3.2-24b-instruct:free`
-
-**Model Features:**
-• Mistral 3.2: Latest, optimized for instructions
-• Llama 4: High-capacity MoE architecture  
-• Dolphin 3.0: General purpose, good for Q&A"""
+        return self._AVAILABLE_MODELS
+    
+    def _video_id(self, url: str) -> str:
+        """Return the 11-character video ID in a YouTube URL, or the URL itself if none is found"""
+        return _video_id_str(url)
+    
+    @staticmethod
+    def _normalize_youtube_url(url: str) -> str:
+        """Force https and drop timestamp/tracking query params so equal videos share cache keys"""
+        if not url.startswith(('http://', 'https://')):
+            url = 'https://' + url
+        parts = urllib.parse.urlsplit(url)
+        query = [
+            (k, v) for k, v in urllib.parse.parse_qsl(parts.query)
+            if k not in _URL_TRACKING_PARAMS
+        ]
+        return urllib.parse.urlunsplit(('https', parts.netloc, parts.path, urllib.parse.urlencode(query), ''))
     
     def _is_youtube_url(self, text: str) -> bool:
         """Check if text contains a YouTube URL"""
-        for pattern in self.get_youtube_patterns():
-            if re.search(pattern, text):
-                return True
-        return False
+        return _is_youtube_url_str(text)
     
-    async def _extract_youtube_subtitles(self, url: str) -> Optional[str]:
-        """Extract subtitles from YouTube video using yt-dlp"""
+    def _blocking_extract(self, url: str) -> Tuple[str, Dict[str, Any], Dict[str, Any]]:
+        """Run yt-dlp metadata extraction (blocking) and return title, subtitles and automatic captions"""
+        # Check out an instance for the duration of the call; YoutubeDL is not thread-safe
+        while True:
+            pool = self._ydl_pool
+            ydl = pool.acquire()
+            if ydl is not None:
+                break
+            if pool is self._ydl_pool:
+                raise RuntimeError("YouTube extractor pool is closed")
+            # A config reload retired the pool while we waited; use its replacement
         try:
-            # Configure yt-dlp options for subtitle extraction
-            ydl_opts = {
-                'writesubtitles': True,
-                'writeautomaticsub': True,
-                'subtitleslangs': ['en', 'en-US', 'en-GB'],
-                'skip_download': True,
-                'quiet': True,
-                'no_warnings': True
-            }
+            info = ydl.extract_info(url, download=False)
+        finally:
+            # Back to the pool it came from, which closes it if that pool was retired meanwhile
+            pool.release(ydl)
+        
+        return (
+            info.get('title', 'Unknown Video'),
+            info.get('subtitles') or {},
+            info.get('automatic_captions') or {}
+        )
+    
+    async def _extract_info(self, url: str) -> Tuple[str, Dict[str, Any], Dict[str, Any]]:
+        """Extract video metadata in a worker thread so the event loop keeps serving other chats"""
+        timeout = self.config["advanced"].get("extraction_timeout", 60)
+        try:
+            # The worker thread can't be interrupted, but the chat gets an answer on time
+            return await asyncio.wait_for(asyncio.to_thread(self._blocking_extract, url), timeout)
+        except asyncio.TimeoutError:
+            self.logger.error(f"⏱️ Video info extraction timed out after {timeout}s")
+            return "Unknown Video", {}, {}
+        except Exception as e:
+            self.logger.error(f"Error extracting video info: {e}")
+            return "Unknown Video", {}, {}
+    
+    async def _fetch_transcript(self, url: str) -> Tuple[str, Optional[str]]:
+        """Extract the video info and download its subtitles, returning (title, transcript)"""
+        # One yt-dlp extraction gives the title and the subtitle track listings
+        title, manual_subs, automatic_captions = await self._extract_info(url)
+        return title, await self._download_subtitles(manual_subs, automatic_captions)
+    
+    async def _coalesce(self, key: Tuple[str, str], start: Callable[[], Awaitable[Any]]) -> Any:
+        """Join the in-flight call for key if there is one, otherwise start it for everyone"""
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(start())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one requester giving up doesn't cancel the work for the others
+        return await asyncio.shield(future)
+    
+    async def _download_subtitles(self, subtitles: Dict[str, Any], automatic_captions: Dict[str, Any]) -> Optional[str]:
+        """Pick the best English subtitle track, download it and return clean text"""
+        try:
+            # Prefer manual subtitles, fall back to automatic
+            sub_data = None
+            for lang in self.config["advanced"]["subtitle_languages"]:
+                sub_data = subtitles.get(lang) or automatic_captions.get(lang)
+                if sub_data:
+                    break
+            
+            if not sub_data:
+                return None
+            
+            # Pick the best available subtitle format in priority order
+            by_ext = {sub_format['ext']: sub_format['url'] for sub_format in sub_data}
+            subtitle_url = next((by_ext[ext] for ext in _SUBTITLE_FORMATS if ext in by_ext), None)
+            
+            if not subtitle_url:
+                return None
+            
+            # Download and parse subtitles
+            async with self._get_session().get(subtitle_url, timeout=self._request_timeout()) as response:
+                if response.status == 200:
+                    return await self._stream_parse(response)
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                # Extract info
-                info = ydl.extract_info(url, download=False)
-                
-                # Try to get subtitles
-                subtitles = info.get('subtitles', {})
-                automatic_captions = info.get('automatic_captions', {})
-                
-                # Prefer manual subtitles, fall back to automatic
-                sub_data = None
-                for lang in ['en', 'en-US', 'en-GB']:
-                    if lang in subtitles:
-                        sub_data = subtitles[lang]
-                        break
-                    elif lang in automatic_captions:
-                        sub_data = automatic_captions[lang]
-                        break
-                
-                if not sub_data:
-                    return None
-                
-                # Find the best subtitle format
-                subtitle_url = None
-                for sub_format in sub_data:
-                    if sub_format['ext'] in ['vtt', 'srv3', 'srv2', 'srv1']:
-                        subtitle_url = sub_format['url']
-                        break
-                
-                if not subtitle_url:
-                    return None
-                
-                # Download and parse subtitles
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(subtitle_url) as response:
-                        if response.status == 200:
-                            subtitle_content = await response.text()
-                            return self._parse_subtitles(subtitle_content)
-                
             return None
             
         except Exception as e:
             self.logger.error(f"Error extracting subtitles: {e}")
             return None
     
-    def _parse_subtitles(self, subtitle_content: str) -> str:
-        """Parse subtitle content and return clean text"""
-        try:
-            lines = subtitle_content.split('\n')
-            text_lines = []
-            
-            for line in lines:
-                line = line.strip()
-                # Skip timestamp lines and empty lines
-                if '-->' in line or not line or line.startswith('WEBVTT') or line.isdigit():
-                    continue
-                
-                # Remove HTML tags
-                line = re.sub(r'<[^>]+>', '', line)
-                
-                # Remove timestamps from within text
-                line = re.sub(r'\d{2}:\d{2}:\d{2}\.\d{3}', '', line)
-                
-                if line:
-                    text_lines.append(line)
-            
-            return ' '.join(text_lines)
-            
-        except Exception as e:
-            self.logger.error(f"Error parsing subtitles: {e}")
-            return ""
+    async def _stream_parse(self, response: aiohttp.ClientResponse) -> str:
+        """Parse a subtitle download as it arrives instead of buffering the whole file"""
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        parts: List[str] = []
+        leftover = ''
+        
+        async for chunk in response.content.iter_chunked(8192):
+            # Clean only complete lines; the trailing partial line is carried into the next chunk
+            pending = leftover + decoder.decode(chunk)
+            block, newline, leftover = pending.rpartition('\n')
+            if not newline and len(pending) > _MAX_PENDING_LINE:
+                # The XML formats can arrive as one long line; cut after the last complete cue
+                # so the carried-over buffer doesn't grow with the whole file. A cue end already
+                # separates words, so the cut point can't change the output.
+                cue_ends = [i + len(tag) for tag in _CUE_END_TAGS if (i := pending.rfind(tag)) >= 0]
+                if cue_ends:
+                    cut = max(cue_ends)
+                    block, leftover = pending[:cut], pending[cut:]
+            text = self._clean_subtitles(block)
+            if text:
+                parts.append(text)
+        
+        text = self._clean_subtitles(leftover + decoder.decode(b'', final=True))
+        if text:
+            parts.append(text)
+        return ' '.join(parts)
     
-    async def _get_youtube_title(self, url: str) -> str:
-        """Get YouTube video title"""
-        try:
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True
-            }
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                return info.get('title', 'Unknown Video')
-                
-        except Exception as e:
-            self.logger.error(f"Error getting video title: {e}")
-            return "Unknown Video"
+    def _clean_subtitles(self, raw: str) -> str:
+        """Strip subtitle structure and markup from a block of whole lines"""
+        # Cue ends separate words; inline tags such as <i> or <c> are dropped without a space so
+        # "Don<b>'</b>t" stays one word. Removed lines leave their newline behind, which split()
+        # treats as whitespace.
+        return ' '.join(_SUBTITLE_CLEAN_RE.sub('', _CUE_END_RE.sub(' ', raw)).split())
     
-    def _cache_transcript(self, url: str, title: str, transcript: str, chat_id: str):
+    def _cache_transcript(self, video_id: str, title: str, transcript: str, chat_id: str):
         """Cache transcript for Q&A functionality"""
         if not self.config["features"]["caching_enabled"]:
             return
             
-        if chat_id not in self.transcript_cache:
-            self.transcript_cache[chat_id] = OrderedDict()
-        
-        # Add to cache
-        self.transcript_cache[chat_id][url] = (title, transcript, datetime.now())
+        # Keyed by video ID alone so URL variants and other chats share one entry; a chat can only
+        # reach it through last_processed_video, i.e. after posting the video itself
+        if self.transcript_cache.get(video_id) is None:
+            # Also keep the copy Q&A sends, so follow-up questions decompress and trim nothing extra
+            compressed = _compress_text(transcript)
+            qa_budget = self.config["processing"]["max_qa_transcript_length"]
+            qa_transcript = self._truncate_middle(transcript, qa_budget)
+            qa_compressed = compressed if qa_transcript is transcript else _compress_text(qa_transcript)
+            self.transcript_cache[video_id] = (title, compressed, qa_budget, qa_compressed)
         
         # Update last processed video
-        self.last_processed_video[chat_id] = url
-        
-        # Limit cache size per room
-        max_cached = self.config["cache"]["max_cached_per_room"]
-        while len(self.transcript_cache[chat_id]) > max_cached:
-            self.transcript_cache[chat_id].popitem(last=False)
+        self.last_processed_video[chat_id] = video_id
+    
+    def _get_cached_transcript(self, video_id: str, for_qa: bool = False) -> Optional[Tuple[str, str]]:
+        """Return (title, transcript) for a cached video, or None; for_qa gives the pre-trimmed Q&A copy"""
+        cached = self.transcript_cache.get(video_id)
+        if not cached:
+            return None
+        title, compressed, qa_budget, qa_compressed = cached
+        # The trimmed copy is stale if max_qa_transcript_length changed since it was cached
+        if for_qa and qa_budget == self.config["processing"]["max_qa_transcript_length"]:
+            return title, _decompress_text(qa_compressed)
+        return title, _decompress_text(compressed)
     
     async def _summarize_with_ai(self, transcript: str, title: str) -> Optional[str]:
         """Summarize transcript using OpenRouter AI with smart approach selection"""
@@ -637,7 +1085,7 @@ class UniversalYouTubePlugin(UniversalBotPlugin):
             self.logger.info("✅ API key found, proceeding with summarization")
             
             # Smart approach selection based on transcript length
-            max_single_pass_length = 25000  # Characters that can fit in single API call
+            max_single_pass_length = self.config["processing"].get("single_pass_limit", 32000)  # Characters that fit in one API call
             
             if len(transcript) <= max_single_pass_length:
                 self.logger.info("🚀 Using single-pass summarization (more efficient)")
@@ -645,7 +1093,9 @@ class UniversalYouTubePlugin(UniversalBotPlugin):
             else:
                 self.logger.info("📦 Using chunked summarization (transcript too long)")
                 return await self._chunked_summarize(transcript, title, api_key)
-                
+        
+        except RateLimitedError:
+            raise
         except Exception as e:
             self.logger.error(f"❌ Error summarizing with AI: {e}")
             import traceback
@@ -660,13 +1110,18 @@ class UniversalYouTubePlugin(UniversalBotPlugin):
             try:
                 self.logger.info(f"🎯 SINGLE-PASS - Attempt {attempt + 1} with model: {model}")
                 
-                async with aiohttp.ClientSession() as session:
-                    result = await self._make_api_call(session, api_key, model, transcript, title, call_type="single_pass")
-                    if result:
-                        if attempt > 0:
-                            self.logger.info(f"✅ Single-pass succeeded with fallback model {model}")
-                        return result
+                result = await self._throttled_api_call(self._get_session(), api_key, model, transcript, title, call_type="single_pass")
+                if result:
+                    if attempt > 0:
+                        self.logger.info(f"✅ Single-pass succeeded with fallback model {model}")
+                    return result
                         
+            except RateLimitedError:
+                raise
+            except AuthError as e:
+                # No other model will accept a rejected key
+                self.logger.error(f"❌ Single-pass aborted: {e}")
+                break
             except Exception as e:
                 self.logger.error(f"❌ Single-pass failed with {model}: {e}")
                 continue
@@ -683,33 +1138,73 @@ class UniversalYouTubePlugin(UniversalBotPlugin):
         
         self.logger.info(f"📊 Chunking parameters: size={chunk_size}, overlap={chunk_overlap}, max={max_chunks}")
         
-        chunks = self._chunk_text(transcript, chunk_size, chunk_overlap)
-        self.logger.info(f"📦 Created {len(chunks)} chunks from transcript")
+        total_chunks = self._count_chunks(len(transcript), chunk_size, chunk_overlap)
+        self.logger.info(f"📦 Transcript splits into {total_chunks} chunks")
         
-        if len(chunks) > max_chunks:
-            self.logger.info(f"⚠️ Limiting to {max_chunks} chunks (was {len(chunks)})")
-            chunks = chunks[:max_chunks]
+        if total_chunks > max_chunks:
+            self.logger.info(f"⚠️ Limiting to {max_chunks} chunks (was {total_chunks})")
         
-        chunk_summaries = []
+        # Only (start, end) offsets are kept here; each chunk task slices its own text
+        chunks = list(itertools.islice(self._chunk_bounds(len(transcript), chunk_size, chunk_overlap), max_chunks))
         
         self.logger.info(f"🔄 Starting chunk processing with {len(chunks)} chunks...")
         
-        async with aiohttp.ClientSession() as session:
-            for i, chunk in enumerate(chunks):
-                self.logger.info(f"🔥 Processing chunk {i + 1}/{len(chunks)} ({len(chunk)} chars)...")
-                
-                chunk_summary = await self._summarize_chunk(session, api_key, chunk, title, i + 1, len(chunks))
-                if chunk_summary:
-                    chunk_summaries.append(chunk_summary)
-                    self.logger.info(f"✅ Chunk {i + 1}/{len(chunks)} completed ({len(chunk_summary)} chars)")
-                else:
-                    self.logger.error(f"❌ Chunk {i + 1}/{len(chunks)} failed")
+        # The semaphore and throttle bound how many chunks hit the API at once
+        session = self._get_session()
+        level = [
+            asyncio.ensure_future(self._summarize_chunk(session, api_key, transcript, bounds, title, i + 1, len(chunks)))
+            for i, bounds in enumerate(chunks)
+        ]
+        
+        # A rejected key (AuthError) or a rate limit we won't wait out (RateLimitedError) fails
+        # every chunk the same way, so cancel the rest instead of queueing them
+        leaves = list(level)
+        def abort_on_fatal_error(future: "asyncio.Future[Optional[str]]") -> None:
+            if not future.cancelled() and isinstance(future.exception(), (AuthError, RateLimitedError)):
+                for leaf in leaves:
+                    leaf.cancel()
+        for leaf in leaves:
+            leaf.add_done_callback(abort_on_fatal_error)
+        tasks = list(leaves)
+        
+        # Map-reduce tree: each run of `fanout` consecutive summaries is merged as soon as that run
+        # finishes, so merging overlaps the slower chunks and the final prompt stays small
+        fanout = self.config["processing"].get("reduce_fanout", 5)
+        while fanout > 1 and len(level) > fanout:
+            self.logger.info(f"🌲 Merging {len(level)} sections in groups of {fanout}")
+            level = [
+                asyncio.ensure_future(self._reduce_group(level[i:i + fanout], title, api_key))
+                for i in range(0, len(level), fanout)
+            ]
+            tasks.extend(level)
+        
+        try:
+            results = await asyncio.gather(*level, return_exceptions=True)
+        finally:
+            # If this summary is cancelled, don't leave chunk or merge calls running unattended
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+        
+        # gather preserves input order, so summaries stay in transcript order
+        chunk_summaries = []
+        for i, chunk_summary in enumerate(results, 1):
+            if isinstance(chunk_summary, BaseException):
+                self.logger.error(f"❌ Section {i}/{len(level)} raised: {chunk_summary}")
+            elif chunk_summary:
+                chunk_summaries.append(chunk_summary)
+                self.logger.info(f"✅ Section {i}/{len(level)} completed ({len(chunk_summary)} chars)")
+            else:
+                self.logger.error(f"❌ Section {i}/{len(level)} failed")
         
         if not chunk_summaries:
             self.logger.error("❌ No chunk summaries were created")
+            for leaf in leaves:
+                if not leaf.cancelled() and isinstance(leaf.exception(), RateLimitedError):
+                    raise leaf.exception()
             return None
         
-        self.logger.info(f"📝 Successfully processed {len(chunk_summaries)} chunks")
+        self.logger.info(f"📝 Successfully processed {len(chunk_summaries)} sections")
         
         # If we have multiple chunks, create a final summary
         if len(chunk_summaries) > 1:
@@ -727,40 +1222,75 @@ class UniversalYouTubePlugin(UniversalBotPlugin):
             self.logger.info("📄 Single chunk, returning chunk summary directly")
             return chunk_summaries[0]
     
-    def _chunk_text(self, text: str, chunk_size: int, overlap: int) -> List[str]:
-        """Split text into overlapping chunks"""
-        if len(text) <= chunk_size:
-            return [text]
+    async def _reduce_group(self, parts: List["asyncio.Future[Optional[str]]"], title: str, api_key: str) -> Optional[str]:
+        """Merge a run of consecutive section summaries once all of them are ready"""
+        results = await asyncio.gather(*parts, return_exceptions=True)
+        summaries = [summary for summary in results if isinstance(summary, str) and summary]
+        if len(summaries) <= 1:
+            return summaries[0] if summaries else None
         
-        chunks = []
-        start = 0
+        combined = "\n\n".join(summaries)
+        fallback_models = self.config.get("ai", {}).get("fallback_models", {}).get("final", [self.config["ai"]["final_model"]])
+        for model in fallback_models:
+            try:
+                merged = await self._throttled_api_call(self._get_session(), api_key, model, combined, title, call_type="merge")
+                if merged:
+                    return merged
+            except (AuthError, RateLimitedError) as e:
+                self.logger.error(f"❌ Merge aborted: {e}")
+                break
+            except Exception as e:
+                self.logger.error(f"❌ Merge failed with {model}: {e}")
         
-        while start < len(text):
+        # Pass the unmerged summaries up rather than losing the section
+        self.logger.warning(f"⚠️ All models failed to merge {len(summaries)} sections, passing them through")
+        return combined
+    
+    @staticmethod
+    def _chunk_bounds(text_length: int, chunk_size: int, overlap: int) -> Iterator[Tuple[int, int]]:
+        """Lazily yield (start, end) offsets of overlapping chunks"""
+        step = chunk_size - overlap
+        min_tail = chunk_size * _MIN_TAIL_FRACTION
+        for start in range(0, max(text_length, 1), step):
             end = start + chunk_size
-            chunk = text[start:end]
-            chunks.append(chunk)
-            
-            if end >= len(text):
+            # Fold a short final chunk into this one instead of spending an API call on it
+            if end < text_length and text_length - (start + step) < min_tail:
+                end = text_length
+            yield start, min(end, text_length)
+            if end >= text_length:
                 break
-            
-            start = end - overlap
-        
-        return chunks
     
-    async def _summarize_chunk(self, session: aiohttp.ClientSession, api_key: str, chunk: str, title: str, chunk_num: int, total_chunks: int) -> Optional[str]:
-        """Summarize a single chunk using OpenRouter with fallback models"""
+    @staticmethod
+    def _count_chunks(text_length: int, chunk_size: int, overlap: int) -> int:
+        """Number of chunks _chunk_bounds yields for a text of this length"""
+        if text_length <= chunk_size:
+            return 1
+        count = math.ceil((text_length - overlap) / (chunk_size - overlap))
+        if text_length - (count - 1) * (chunk_size - overlap) < chunk_size * _MIN_TAIL_FRACTION:
+            count -= 1
+        return count
+    
+    async def _summarize_chunk(self, session: aiohttp.ClientSession, api_key: str, transcript: str, bounds: Tuple[int, int], title: str, chunk_num: int, total_chunks: int) -> Optional[str]:
+        """Summarize the transcript[start:end] chunk using OpenRouter with fallback models"""
         fallback_models = self.config.get("ai", {}).get("fallback_models", {}).get("chunk", [self.config["ai"]["chunk_model"]])
+        start, end = bounds
+        chunk = transcript[start:end]
+        
+        self.logger.info(f"🔥 Processing chunk {chunk_num}/{total_chunks} ({len(chunk)} chars)...")
         
         for attempt, model in enumerate(fallback_models):
             try:
                 self.logger.info(f"🔥 CHUNK {chunk_num}/{total_chunks} - Attempt {attempt + 1} with model: {model}")
                 
-                result = await self._make_api_call(session, api_key, model, chunk, title, chunk_num, total_chunks, "chunk")
+                result = await self._throttled_api_call(session, api_key, model, chunk, title, chunk_num, total_chunks, "chunk")
                 if result:
                     if attempt > 0:
                         self.logger.info(f"✅ Chunk {chunk_num}/{total_chunks} succeeded with fallback model {model}")
                     return result
                     
+            except (AuthError, RateLimitedError) as e:
+                self.logger.error(f"❌ Chunk {chunk_num}/{total_chunks} aborted: {e}")
+                raise
             except Exception as e:
                 self.logger.error(f"❌ Chunk {chunk_num}/{total_chunks} failed with {model}: {e}")
                 continue
@@ -768,114 +1298,208 @@ class UniversalYouTubePlugin(UniversalBotPlugin):
         self.logger.error(f"❌ All fallback models failed for chunk {chunk_num}/{total_chunks}")
         return None
     
-    async def _make_api_call(self, session: aiohttp.ClientSession, api_key: str, model: str, text: str, title: str, chunk_num: int = None, total_chunks: int = None, call_type: str = "summary") -> Optional[str]:
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use or after it was closed"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=64, limit_per_host=32, keepalive_timeout=75, ttl_dns_cache=300),
+                timeout=self._request_timeout()
+            )
+        return self._session
+    
+    def _request_timeout(self) -> aiohttp.ClientTimeout:
+        """Per-request timeout from the current config, so a reloaded ai_timeout applies without a new session"""
+        # total bounds a whole completion; connect and sock_read catch a dead host or a
+        # stream that stalls mid-response long before that
+        return aiohttp.ClientTimeout(
+            total=self.config["advanced"].get("ai_timeout", 120), connect=10, sock_read=60
+        )
+    
+    async def _warmup(self):
+        """Populate the DNS cache and a pooled keep-alive connection to OpenRouter"""
+        try:
+            async with self._get_session().head(_OPENROUTER_MODELS_URL, timeout=aiohttp.ClientTimeout(total=5)):
+                pass
+            self.logger.debug("🔥 OpenRouter connection warmed up")
+        except Exception as e:
+            self.logger.debug("OpenRouter warm-up failed: %s", e)
+    
+    async def _throttle(self):
+        """Space request starts evenly to stay under ai.requests_per_minute (0 disables) and honour rate-limit pauses"""
+        rpm = self.config["ai"].get("requests_per_minute", 0)
+        
+        async with self._throttle_lock:
+            now = time.monotonic()
+            wait = self._next_request_at - now
+            if rpm:
+                self._next_request_at = max(now, self._next_request_at) + 60.0 / rpm
+        
+        if wait > 0:
+            await asyncio.sleep(wait)
+    
+    async def _throttled_api_call(self, session: aiohttp.ClientSession, api_key: str, model: str, text: str, title: str, chunk_num: int = None, total_chunks: int = None, call_type: str = "summary", question: str = None, retry_rate_limits: bool = True) -> Optional[str]:
+        """_make_api_call under the concurrency limit, backing off exponentially on transient errors
+        
+        With retry_rate_limits=False a 429 raises RateLimitedError straight away instead of backing off.
+        """
+        data, cache_key = self._build_request(model, text, title, chunk_num, total_chunks, call_type, question)
+        
+        # Identical requests (same chunk re-summarized, same video re-posted) are answered from
+        # cache before the throttle and semaphore, so only misses pay the rate limit
+        if cache_key:
+            cached = self._llm_cache.get(cache_key)
+            if cached is not None:
+                self.logger.info(f"♻️ {call_type.upper()} cache hit for {model} ({len(cached)} chars)")
+                return cached
+        
+        retry_attempts = self.config["advanced"].get("retry_attempts", 3)
+        
+        for attempt in range(retry_attempts):
+            await self._throttle()
+            try:
+                async with self._api_sem:
+                    return await self._make_api_call(session, api_key, model, data, call_type, cache_key)
+            except RetryableAPIError as e:
+                if e.status == 429:
+                    # A rate limit applies to every sibling chunk too; hold all new requests for a
+                    # bounded time instead of letting each discover the 429 on its own
+                    pause = min(_MAX_RATE_LIMIT_PAUSE, e.retry_after or 2 ** attempt + random.random())
+                    self._next_request_at = max(self._next_request_at, time.monotonic() + pause)
+                if e.status == 429 and not retry_rate_limits:
+                    raise RateLimitedError(e.retry_after)
+                if attempt == retry_attempts - 1:
+                    break
+                if e.retry_after and e.retry_after > _MAX_RETRY_DELAY:
+                    self.logger.error(f"❌ {call_type.upper()} got HTTP {e.status} from {model} with Retry-After {e.retry_after:.0f}s, giving up")
+                    raise RateLimitedError(e.retry_after)
+                delay = min(_MAX_RETRY_DELAY, e.retry_after or 2 ** attempt + random.random())
+                self.logger.warning(f"⏳ {call_type.upper()} got HTTP {e.status} from {model}, retrying in {delay:.1f}s ({attempt + 1}/{retry_attempts})")
+                # Sleep outside the semaphore so other chunks can use the slot
+                await asyncio.sleep(delay)
+        
+        self.logger.error(f"❌ {call_type.upper()} still failing on {model} after {retry_attempts} attempts")
+        return None
+    
+    def _build_request(self, model: str, text: str, title: str, chunk_num: int = None, total_chunks: int = None, call_type: str = "summary", question: str = None) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Render the prompt into an OpenRouter request body and its LLM cache key (None when caching is off)"""
+        instructions, template, max_tokens_key = _PROMPT_TEMPLATES.get(call_type, (None, "{text}", "qa_response"))
+        prompt = template.format_map({
+            "title": title, "text": text, "chunk_num": chunk_num, "total_chunks": total_chunks,
+            "question": question
+        })
+        messages = [{"role": "user", "content": prompt}]
+        if instructions:
+            messages.insert(0, {
+                "role": "system",
+                "content": [{"type": "text", "text": instructions, "cache_control": {"type": "ephemeral"}}]
+            })
+        max_tokens = self.config["ai"]["max_tokens"][max_tokens_key]
+        
+        temperature = self.config["ai"]["temperature"]["qa" if call_type == "qa" else "summarization"]
+        
+        data = {
+            "model": model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            # Stream tokens so the body is decoded while it is still being generated
+            "stream": True
+        }
+        
+        cache_key = None
+        if self.config["features"]["caching_enabled"]:
+            cache_key = hashlib.sha256(
+                f"{model}\0{call_type}\0{temperature}\0{max_tokens}\0{prompt}".encode()
+            ).hexdigest()
+        return data, cache_key
+    
+    async def _make_api_call(self, session: aiohttp.ClientSession, api_key: str, model: str, data: Dict[str, Any], call_type: str = "summary", cache_key: Optional[str] = None) -> Optional[str]:
         """Generic API call with error handling"""
         try:
-            url = "https://openrouter.ai/api/v1/chat/completions"
-            
-            headers = {
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json",
-                "HTTP-Referer": "https://github.com/your-repo",
-                "X-Title": "YouTube Bot Plugin"
-            }
-            
-            # Create appropriate prompt based on call type
-            if call_type == "chunk":
-                prompt = f"""Summarize this part ({chunk_num}/{total_chunks}) of the YouTube video "{title}".
-
-Focus on:
-- Key points and main ideas
-- Important details and facts
-- Actionable insights
-- Notable quotes or examples
-
-Keep it concise but informative:
-
-{text}"""
-                max_tokens = self.config["ai"]["max_tokens"]["chunk_summary"]
-            elif call_type == "final":
-                prompt = f"""Create a comprehensive summary of the YouTube video "{title}" based on these section summaries:
-
-{text}
-
-Create a well-structured summary that:
-- Captures the main theme and purpose
-- Highlights key points and insights in detail
-- Maintains logical flow and structure
-- Includes important examples, quotes, and actionable insights
-- Is thorough but well-organized
-
-Format with clear sections and bullet points where appropriate."""
-                max_tokens = self.config["ai"]["max_tokens"]["final_summary"]
-            elif call_type == "single_pass":
-                prompt = f"""Create a comprehensive summary of the YouTube video "{title}" based on its complete transcript:
-
-{text}
-
-Create a well-structured summary that:
-- Captures the main theme and purpose
-- Highlights all key points and insights in detail
-- Maintains logical flow and structure
-- Includes important examples, quotes, and actionable insights
-- Is thorough but well-organized
-
-Format with clear sections and bullet points where appropriate. Be comprehensive since this is the only chance to capture all important information."""
-                max_tokens = self.config["ai"]["max_tokens"]["final_summary"]
-            else:
-                prompt = text
-                max_tokens = self.config["ai"]["max_tokens"]["qa_response"]
-            
-            temperature = self.config["ai"]["temperature"]["summarization"]
-            
-            data = {
-                "model": model,
-                "messages": [
-                    {"role": "user", "content": prompt}
-                ],
-                "max_tokens": max_tokens,
-                "temperature": temperature
-            }
+            headers = _openrouter_headers(api_key)
             
-            import time
-            start_time = time.time()
+            loop = asyncio.get_running_loop()
+            start_time = loop.time()
             
-            async with session.post(url, headers=headers, json=data) as response:
-                elapsed = time.time() - start_time
+            async with session.post(_OPENROUTER_URL, headers=headers, data=_json_dumps(data), timeout=self._request_timeout()) as response:
+                elapsed = loop.time() - start_time
                 
                 if response.status == 200:
-                    result = await response.json()
-                    content = result['choices'][0]['message']['content'].strip()
+                    content = (await self._read_stream(response)).strip()
+                    elapsed = loop.time() - start_time
                     self.logger.info(f"✅ {call_type.upper()} API success with {model} ({elapsed:.2f}s, {len(content)} chars)")
+                    if cache_key and content:
+                        self._llm_cache[cache_key] = content
                     return content
+                elif response.status in _AUTH_STATUSES:
+                    error_text = await response.text()
+                    self.logger.error(f"❌ {call_type.upper()} API auth error {response.status} with {model}: {error_text}")
+                    raise AuthError(response.status)
+                elif response.status in _RETRYABLE_STATUSES:
+                    error_text = await response.text()
+                    self.logger.warning(f"⚠️ {call_type.upper()} API transient error {response.status} with {model} ({elapsed:.2f}s): {error_text}")
+                    retry_after = response.headers.get("Retry-After")
+                    raise RetryableAPIError(response.status, float(retry_after) if retry_after and retry_after.isdigit() else None)
                 else:
                     error_text = await response.text()
                     self.logger.error(f"❌ {call_type.upper()} API error {response.status} with {model} ({elapsed:.2f}s): {error_text}")
                     return None
                     
+        except (AuthError, RetryableAPIError):
+            raise
         except Exception as e:
             self.logger.error(f"❌ {call_type.upper()} API exception with {model}: {e}")
             return None
     
+    async def _read_stream(self, response: aiohttp.ClientResponse) -> str:
+        """Concatenate the delta content of an OpenRouter server-sent event stream"""
+        parts = []
+        async for line in response.content:
+            # Skip blank separators and ": OPENROUTER PROCESSING" keep-alive comments
+            if not line.startswith(b"data: "):
+                continue
+            
+            payload = line[6:].strip()
+            if payload == b"[DONE]":
+                break
+            
+            event = _json_loads(payload)
+            if "error" in event:
+                raise RuntimeError(f"stream error: {event['error'].get('message', event['error'])}")
+            
+            choices = event.get("choices")
+            if choices:
+                parts.append(choices[0].get("delta", {}).get("content") or "")
+        
+        return ''.join(parts)
+    
     async def _create_final_summary(self, combined_summaries: str, title: str) -> Optional[str]:
         """Create final summary from chunk summaries with fallback models"""
         api_key = os.getenv("OPENROUTER_API_KEY")
         if not api_key:
             return combined_summaries
         
+        # Short section summaries are already a usable summary; skip the extra round-trip
+        skip_threshold = self.config["ai"].get("final_skip_threshold", 2000)
+        if len(combined_summaries) < skip_threshold:
+            self.logger.info(f"⏭️ Combined summaries are short ({len(combined_summaries)} < {skip_threshold} chars), skipping final summary call")
+            return combined_summaries
+        
         fallback_models = self.config.get("ai", {}).get("fallback_models", {}).get("final", [self.config["ai"]["final_model"]])
         
         for attempt, model in enumerate(fallback_models):
             try:
                 self.logger.info(f"🎯 FINAL SUMMARY - Attempt {attempt + 1} with model: {model}")
                 
-                async with aiohttp.ClientSession() as session:
-                    result = await self._make_api_call(session, api_key, model, combined_summaries, title, call_type="final")
-                    if result:
-                        if attempt > 0:
-                            self.logger.info(f"✅ Final summary succeeded with fallback model {model}")
-                        return result
+                result = await self._throttled_api_call(self._get_session(), api_key, model, combined_summaries, title, call_type="final")
+                if result:
+                    if attempt > 0:
+                        self.logger.info(f"✅ Final summary succeeded with fallback model {model}")
+                    return result
                         
+            except (AuthError, RateLimitedError) as e:
+                self.logger.error(f"❌ Final summary aborted: {e}")
+                break
             except Exception as e:
                 self.logger.error(f"❌ Final summary failed with {model}: {e}")
                 continue
@@ -883,67 +1507,47 @@ Format with clear sections and bullet points where appropriate. Be comprehensive
         self.logger.warning("❌ All fallback models failed for final summary, returning combined chunks")
         return combined_summaries
     
+    @staticmethod
+    def _truncate_middle(text: str, budget: int) -> str:
+        """Fit text into budget characters by eliding the middle rather than dropping the tail"""
+        if len(text) <= budget:
+            return text
+        
+        keep = max(budget - len(_ELISION_MARKER), 0)
+        head = keep - keep // 2
+        return text[:head] + _ELISION_MARKER + text[len(text) - keep // 2:]
+    
     async def _answer_question_about_video(self, transcript: str, title: str, question: str) -> str:
-        """Answer a question about the video using AI"""
+        """Answer a question about the video using AI with fallback models"""
         try:
             api_key = os.getenv("OPENROUTER_API_KEY")
             if not api_key:
                 return "❌ AI features require OPENROUTER_API_KEY"
             
-            url = "https://openrouter.ai/api/v1/chat/completions"
-            
-            headers = {
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json",
-                "HTTP-Referer": "https://github.com/your-repo",
-                "X-Title": "YouTube Bot Plugin"
-            }
-            
-            # Limit transcript length for Q&A
-            max_qa_length = self.config["processing"]["max_qa_transcript_length"]
-            if len(transcript) > max_qa_length:
-                transcript = transcript[:max_qa_length] + "..."
-            
-            prompt = f"""Answer the following question about the YouTube video "{title}" based on its transcript:
-
-Question: {question}
-
-Video transcript:
-{transcript}
-
-Provide a helpful, accurate answer based on the content. If the information isn't in the transcript, say so."""
-            
-            # Log what values are actually being used
-            qa_model = self.config["ai"]["qa_model"]
-            max_tokens = self.config["ai"]["max_tokens"]["qa_response"]
-            temperature = self.config["ai"]["temperature"]["qa"]
-            
-            self.logger.info(f"💬 Q&A API CALL - model: {qa_model}")
-            self.logger.info(f"💬 Q&A API CALL - max_tokens: {max_tokens}")
-            self.logger.info(f"💬 Q&A API CALL - temperature: {temperature}")
+            # Limit transcript length for Q&A, keeping both the intro and the conclusion
+            transcript = self._truncate_middle(transcript, self.config["processing"]["max_qa_transcript_length"])
             self.logger.info(f"💬 Q&A API CALL - transcript length: {len(transcript)} chars")
             
-            data = {
-                "model": qa_model,
-                "messages": [
-                    {"role": "user", "content": prompt}
-                ],
-                "max_tokens": max_tokens,
-                "temperature": temperature
-            }
+            # ai.qa_model goes first; the fallbacks only cover models that fail outright. A 429 ends
+            # the loop (RateLimitedError) since the other free models share the account's limit.
+            qa_model = self.config["ai"]["qa_model"]
+            fallback_models = self.config.get("ai", {}).get("fallback_models", {}).get("qa", [])
+            models = [qa_model] + [model for model in fallback_models if model != qa_model]
+            for attempt, model in enumerate(models):
+                self.logger.info(f"💬 Q&A - Attempt {attempt + 1} with model: {model}")
+                answer = await self._throttled_api_call(
+                    self._get_session(), api_key, model, transcript, title, call_type="qa", question=question,
+                    retry_rate_limits=False
+                )
+                if answer:
+                    return answer
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=headers, json=data) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        content = result['choices'][0]['message']['content'].strip()
-                        self.logger.info(f"✅ Q&A API success with {qa_model} ({len(content)} chars)")
-                        return content
-                    else:
-                        error_text = await response.text()
-                        self.logger.error(f"❌ Q&A API error {response.status} with {qa_model}: {error_text}")
-                        return "❌ Failed to process question with AI"
-                        
+            return "❌ Failed to process question with AI"
+        
+        except AuthError as e:
+            return f"❌ {e}. Check OPENROUTER_API_KEY."
+        except RateLimitedError as e:
+            return f"⏳ {e}. Please try again later."
         except Exception as e:
             self.logger.error(f"Error answering question: {e}")
             return f"❌ Error processing question: {str(e)}"
@@ -952,6 +1556,15 @@ Provide a helpful, accurate answer based on the content. If the information isn'
         """Cleanup when plugin is unloaded"""
         self.transcript_cache.clear()
         self.last_processed_video.clear()
+        self._llm_cache.clear()
+        for future in list(self._inflight.values()):
+            future.cancel()
+        self._ydl_pool.close()
+        if self._warmup_task and not self._warmup_task.done():
+            self._warmup_task.cancel()
+        if self._session:
+            await self._session.close()
+            self._session = None
         self.logger.info("Universal YouTube plugin cleanup completed")
 
 